@@ -4,18 +4,22 @@
 import re
 import time
 import random
+import os
 import sys
+import threading
+import traceback
 import keyboard
 import pyautogui
 import cv2  # OpenCV
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Tuple, Any
 
 # Local imports
 from src import AppConfig, load_config
-from src.vision import ScreenCapture, TemplateMatcher
-from src.human_input import HumanMouse
+from src.vision import ScreenCapture, TemplateMatcher, TemplateEntry, MatchResult, make_matcher, KIND_STOP, KIND_WEB, KIND_OTHER
+from src.human_input import HumanMouse, build_click_and_keys, failsafe_check, send_input_batch
 from src.ui import Dashboard, make_logger
 
 # Configuration
@@ -82,8 +86,50 @@ profiles:
 """
 
 
-# Small visual delay between template scans so the dashboard shows progress
-SCAN_VISUAL_DELAY = 0.02
+# config.yaml rewrite patterns used by the setup wizard
+# Display keys are fused into one alternation so the file is scanned once
+_CFG_UPDATE_RE = re.compile(r'\b(?P<key>monitor|expected_width|expected_height)(?P<sep>:\s*)\d+')
+# Value only - the quoted/bare value is swapped, a trailing "# comment" is kept
+_ACTIVE_PROFILE_RE = re.compile(r'(active_profile:)[ \t]*(?:"[^"\n]*"|\'[^\'\n]*\'|[^#\n]*?)([ \t]*#|[ \t]*$)', re.M)
+
+# Profile names: anything outside this whitelist is stripped (no separators, no drive colons)
+_PROFILE_SANITIZE_RE = re.compile(r'[^A-Za-z0-9._\- ]')
+
+# Stop signals need a high score to avoid false positives (ending the run early)
+STOP_CONFIDENCE = 0.85
+
+# Template that confirms a web download actually started
+VERIFY_PREFIX = "web_download_started"
+
+# Pre-drawn sleep jitter values per batch (see _next_jitter)
+JITTER_BUF_SIZE = 4096
+
+# How far ahead of a sleep's end the next screen grab starts (see smart_sleep)
+PREFETCH_LEAD_SECONDS = 0.05
+
+# Download-verify polling backoff: first retry after MIN, growing by GROWTH up to MAX (seconds)
+VERIFY_POLL_MIN = 0.05
+VERIFY_POLL_GROWTH = 1.5
+VERIFY_POLL_MAX = 0.3
+
+# Coarse-pass rejection floor, relative to marginal_threshold
+PYRAMID_MARGIN = 0.10
+
+# Upper bound on a single idle wait while paused, so Ctrl+C still gets through on Windows
+IDLE_WAIT_SECONDS = 1.0
+
+
+def _reader_pause(seconds: float) -> None:
+    # Wizard "let them read it" delays - only when someone is actually at the terminal
+    if sys.stdin is not None and sys.stdin.isatty():
+        time.sleep(seconds)
+
+def _template_kind(name: str) -> int:
+    # Classify a template by filename prefix (stop_ > web_ > everything else)
+    n = name.lower()
+    if n.startswith("stop_"): return KIND_STOP
+    if n.startswith("web_"): return KIND_WEB
+    return KIND_OTHER
 
 class NexusBot:
     # Main bot class - handles all the clicking and scanning
@@ -94,10 +140,41 @@ class NexusBot:
         self.paused: bool = True # Start paused as requested
         self.reload_requested: bool = False
         self.cycle_requested: bool = False
+        self._wake = threading.Event()  # Set by hotkeys to interrupt sleeps immediately
+        # Sleep jitter drawn in batches instead of one random.uniform per sleep
+        self._rng = np.random.default_rng()
+        self._jitter_buf: List[float] = self._rng.uniform(-1.0, 1.0, JITTER_BUF_SIZE).tolist()
+        self._jitter_idx = 0
+        self._hotkey_map: Dict[str, Any] = {}  # Normalized key name -> handler (single-key hotkeys)
+        self._keys_down: set = set()  # Keys currently held, to ignore auto-repeat
+        # Per-tick template matching fans out here; one pool for the process, not per reload.
+        # Half the cores: each matchTemplate already spreads over OpenCV's own worker threads,
+        # so a full-width pool would just oversubscribe them
+        self._match_pool = ThreadPoolExecutor(
+            max_workers=max(1, (os.cpu_count() or 2) // 2), thread_name_prefix="match"
+        )
         
         # Runtime State
         self.profile: str = ""
-        self.templates: Dict[str, np.ndarray] = {}
+        self.templates: Dict[str, TemplateEntry] = {}
+        self._stop_items: List[TemplateEntry] = []   # Pre-split by kind at load time
+        self._web_items: List[TemplateEntry] = []
+        self._other_items: List[TemplateEntry] = []
+        self._order_web_first: List[TemplateEntry] = []   # Non-stop scan orders, rebuilt on reload
+        self._order_other_first: List[TemplateEntry] = []
+        self._verify_entry: Optional[TemplateEntry] = None  # "Your download has started" text
+        self._kind_thresholds: Tuple[float, float, float] = (STOP_CONFIDENCE, 0.8, 0.8)
+        self._close_tab_batch = None  # Pre-built click + close_tab SendInput batch, None -> fallback
+        # Hot-path config values, refreshed by _reload_systems
+        self._grayscale = True
+        self._strategy_label = ""
+        self._use_pyramid = False
+        self._coarse_floor = 0.0
+        self._fallback_cycles = 0
+        self._jitter = 0.0
+        self._sleep_range = (1.5, 4.0)
+        # Decoded templates by path -> ((mtime_ns, size), imread flags, entry); survives reloads
+        self._template_cache: Dict[Path, Tuple[Tuple[int, int], int, TemplateEntry]] = {}
         self.last_pause_state: bool = True  # Matches paused=True initial state
         self.expecting_web: bool = False
         self.no_match_streak: int = 0
@@ -141,22 +218,56 @@ class NexusBot:
 
     def _bind_hotkeys(self):
         # Register keyboard shortcuts for controlling the bot
-        keyboard.add_hotkey(self.cfg.hotkeys.pause_bot, self._toggle_pause)
-        keyboard.add_hotkey(self.cfg.hotkeys.stop_bot, self._stop)
-        keyboard.add_hotkey(self.cfg.hotkeys.reload_bot, self._request_reload)
-        keyboard.add_hotkey(self.cfg.hotkeys.cycle_strategy, self._request_cycle)
+        # Single-key bindings share one hook with a name -> handler dict; only
+        # chords ("ctrl+f9") need keyboard's own hotkey matcher
+        bindings = (
+            (self.cfg.hotkeys.pause_bot, self._toggle_pause),
+            (self.cfg.hotkeys.stop_bot, self._stop),
+            (self.cfg.hotkeys.reload_bot, self._request_reload),
+            (self.cfg.hotkeys.cycle_strategy, self._request_cycle),
+        )
+        self._hotkey_map = {}
+        for key, handler in bindings:
+            if "+" in key:
+                keyboard.add_hotkey(key, handler)
+            else:
+                self._hotkey_map[keyboard.normalize_name(key)] = handler
+        if self._hotkey_map:
+            keyboard.hook(self._on_key)
+
+    def _on_key(self, event):
+        # Fire on the first key-down only; auto-repeat while held is swallowed until key-up
+        name = event.name
+        if event.event_type == keyboard.KEY_UP:
+            self._keys_down.discard(name)
+            return
+        if name in self._keys_down:
+            return
+        self._keys_down.add(name)
+        handler = self._hotkey_map.get(name)
+        if handler is None:
+            return
+        # Like add_hotkey: only the bare key counts - Shift+F10 (context menu) or
+        # Ctrl+F5 (browser hard refresh) must not quit or reload the bot
+        if any(k != name and keyboard.is_modifier(k) for k in self._keys_down):
+            return
+        handler()
 
     def _toggle_pause(self):
         self.paused = not self.paused
+        self._wake.set()
 
     def _stop(self):
         self.running = False
+        self._wake.set()
 
     def _request_reload(self):
         self.reload_requested = True
+        self._wake.set()
 
     def _request_cycle(self):
         self.cycle_requested = True
+        self._wake.set()
 
     def _ensure_profile(self):
         # Make sure we have a valid profile selected
@@ -184,6 +295,7 @@ class NexusBot:
         
         temp_screen = ScreenCapture()
         monitors = temp_screen.list_monitors()
+        temp_screen.close()
         
         if len(monitors) > 2:  # Multi-monitor setup
             print("Detected multiple monitors:")
@@ -241,29 +353,6 @@ class NexusBot:
             else:
                 print(f">> Resolution matches config ({mon_w}x{mon_h}) [OK]")
         
-        # Persist settings
-        try:
-            cfg_path = Path("config.yaml")
-            if cfg_path.exists():
-                content = cfg_path.read_text(encoding="utf-8")
-                
-                # Update monitor index
-                content = re.sub(
-                    r'(monitor:\s*)\d+',
-                    f'\\1{monitor_choice}',
-                    content,
-                    count=1
-                )
-                
-                # Update resolution
-                content = re.sub(r'(expected_width:\s*)\d+', f'\\1{self.cfg.display.expected_width}', content)
-                content = re.sub(r'(expected_height:\s*)\d+', f'\\1{self.cfg.display.expected_height}', content)
-                
-                cfg_path.write_text(content, encoding="utf-8")
-                print(">> Settings saved [OK]")
-        except Exception as e:
-            print(f">> Warning: Failed to save settings: {e}")
-        
         # STEP 3: Profile Selection
         print("\n" + "─"*60)
         print(" STEP 3: PROFILE SETUP")
@@ -279,7 +368,7 @@ class NexusBot:
             # Default name; user can rename the folder or create new profiles later
             (profiles_dir / "example").mkdir(parents=True, exist_ok=True)
             self.profile = "example"
-            time.sleep(1.0)
+            _reader_pause(1.0)
         else:
             print("Available Profiles:")
             for i, name in enumerate(available, 1):
@@ -296,7 +385,7 @@ class NexusBot:
                     elif choice == len(available) + 1:
                         new_name = input("Enter new profile name: ").strip()
                         # S-2: Sanitize profile name to prevent path traversal
-                        new_name = new_name.replace("\\", "").replace("/", "").replace("..", "").strip(". ")
+                        new_name = _PROFILE_SANITIZE_RE.sub("", new_name).strip(". ")
                         if new_name:
                             new_path = (profiles_dir / new_name).resolve()
                             if not str(new_path).startswith(str(profiles_dir.resolve())):
@@ -312,19 +401,29 @@ class NexusBot:
         print(f"\n>> Selected Profile: '{self.profile}'")
         self.cfg.profiles.active_profile = self.profile
         
+        # Persist monitor, resolution and profile in one read/write of config.yaml
         try:
             cfg_path = Path("config.yaml")
             if cfg_path.exists():
                 content = cfg_path.read_text(encoding="utf-8")
-                new_content = re.sub(
-                    r'(active_profile:\s*)["\']?[^"\']*("[^"]*"|\'[^\']*\')?[^\n]*', 
-                    f'\\1"{self.profile}"', 
-                    content, 
-                    count=1
-                )
+                
+                # Update monitor index and resolution in one pass (first occurrence of each key)
+                new_vals = {
+                    "monitor": monitor_choice,
+                    "expected_width": self.cfg.display.expected_width,
+                    "expected_height": self.cfg.display.expected_height,
+                }
+                def _update(m):
+                    val = new_vals.pop(m["key"], None)
+                    if val is None: return m[0]
+                    return f"{m['key']}{m['sep']}{val}"
+                new_content = _CFG_UPDATE_RE.sub(_update, content)
+                new_content = _ACTIVE_PROFILE_RE.sub(f'\\g<1> "{self.profile}"\\g<2>', new_content, count=1)
+                
+                # Skip the write when nothing changed (no mtime bump for the config cache)
                 if new_content != content:
                     cfg_path.write_text(new_content, encoding="utf-8")
-                    print(">> Profile saved to config [OK]")
+                print(">> Settings saved to config [OK]")
         except Exception as e:
             print(f">> Warning: Failed to save config: {e}")
 
@@ -336,12 +435,12 @@ class NexusBot:
         print(" 1. Edit 'config.yaml' manually")
         print(" 2. OR delete 'active_profile' line to re-run this wizard")
         print("─"*60 + "\n")
-        time.sleep(2.0)
+        _reader_pause(2.0)
         print("─"*60 + "\n")
-        time.sleep(2.0) # Let them read it
+        _reader_pause(2.0) # Let them read it
 
     def _init_ui(self):
-        cycle_key = getattr(self.cfg.hotkeys, 'cycle_strategy', 'f8')
+        cycle_key = self.cfg.hotkeys.cycle_strategy
         self.dash = Dashboard(
             profile=self.cfg.profiles.active_profile,
             night_hour=self.cfg.ui.night_mode_hour,
@@ -356,25 +455,68 @@ class NexusBot:
         self.dash.start()
 
 
-    def _load_templates(self) -> Dict[str, np.ndarray]:
+    def _load_templates(self) -> Dict[str, TemplateEntry]:
         # Load all template images from current profile folder
-        templates = {}
+        # Decoded straight to grayscale when enabled, so matching never converts templates.
+        # Files unchanged since the last load (same mtime and size) reuse the cached entry.
         base = Path("profiles") / self.profile
+        flags = cv2.IMREAD_GRAYSCALE if self.cfg.matching.use_grayscale else cv2.IMREAD_COLOR
+        found: Dict[Path, Optional[TemplateEntry]] = {}  # Glob order, None until decoded
+        misses = []
         if base.exists():
             for p in base.glob("*.png"):
-                img = cv2.imread(str(p))
-                if img is not None:
-                    templates[p.stem] = img
-        return templates
+                try:
+                    st = p.stat()
+                    stamp = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+                cached = self._template_cache.get(p)
+                if cached and cached[0] == stamp and cached[1] == flags:
+                    found[p] = cached[2]
+                else:
+                    found[p] = None
+                    misses.append((p, stamp))
+        
+        def decode(p: Path) -> Optional[np.ndarray]:
+            # Raw bytes -> imdecode straight to the target format (no BGR intermediate
+            # when grayscale); also copes with non-ASCII profile paths imread chokes on
+            try:
+                buf = np.fromfile(p, dtype=np.uint8)
+            except OSError:
+                return None
+            if buf.size == 0: return None
+            return cv2.imdecode(buf, flags)
+        
+        # imdecode releases the GIL while inflating, so cache misses decode in parallel
+        if len(misses) > 1:
+            workers = min(8, os.cpu_count() or 1, len(misses))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                images = list(ex.map(decode, [p for p, _ in misses]))
+        else:
+            images = [decode(p) for p, _ in misses]
+        
+        # Template stats for every decoded miss in one batch
+        decoded = [(p, stamp, img) for (p, stamp), img in zip(misses, images) if img is not None]
+        entries = TemplateEntry.from_images([(p.stem, img, _template_kind(p.stem)) for p, _, img in decoded])
+        for (p, stamp, _), entry in zip(decoded, entries):
+            found[p] = entry
+            self._template_cache[p] = (stamp, flags, entry)
+        
+        # Drop entries for files that are gone (or belong to another profile now)
+        for stale in self._template_cache.keys() - found.keys():
+            del self._template_cache[stale]
+        return {p.stem: entry for p, entry in found.items() if entry is not None}
 
     def _reload_systems(self, initial: bool = False):
         # Reinitialize matcher/mouse when config changes
         # Update components with new config values
-        self.matcher = TemplateMatcher(
+        # Matcher class is specialized to the strategy here, not branched on per match
+        self.matcher = make_matcher(
+            self.cfg.matching.strategy,
             confidence=self.cfg.matching.confidence_threshold,
             marginal=self.cfg.matching.marginal_threshold,
             grayscale=self.cfg.matching.use_grayscale,
-            strategy=self.cfg.matching.strategy,
+            method=self.cfg.matching.correlation,
             debug_path=Path("logs/debug") if self.cfg.visual.debug_mode else None,
             log_fn=self.log
         )
@@ -392,9 +534,42 @@ class NexusBot:
         
         # Load templates
         self.templates = self._load_templates()
+        entries = list(self.templates.values())
+        # Search boxes from config (set every reload - entries are reused across reloads)
+        regions = self.cfg.matching.regions
+        for e in entries:
+            e.region = regions.get(e.name)
+        self._stop_items = [e for e in entries if e.kind == KIND_STOP]
+        self._web_items = [e for e in entries if e.kind == KIND_WEB]
+        self._other_items = [e for e in entries if e.kind == KIND_OTHER]
+        self._order_web_first = self._web_items + self._other_items
+        self._order_other_first = self._other_items + self._web_items
+        self._verify_entry = next((e for e in self._web_items if e.name.startswith(VERIFY_PREFIX)), None)
+        # Hit threshold per template kind, indexed by KIND_* so the scan loop does a tuple lookup
+        conf = self.cfg.matching.confidence_threshold
+        self._kind_thresholds = (STOP_CONFIDENCE, conf, conf)
+        
+        # Focus click + close-tab chord, compiled once into a single SendInput batch (Windows)
+        self._close_tab_batch = None
+        try:
+            steps = keyboard.parse_hotkey(self.cfg.hotkeys.close_tab)
+            if len(steps) == 1:
+                self._close_tab_batch = build_click_and_keys([codes[0] for codes in steps[0]])
+        except ValueError:
+            pass
+        
+        # Config values the tick/sleep loops read, flattened out of the dataclass chains
+        m, t = self.cfg.matching, self.cfg.timing
+        self._grayscale = m.use_grayscale
+        self._strategy_label = m.strategy.upper()
+        self._use_pyramid = m.use_grayscale and m.strategy in ("cascade", "template")
+        self._coarse_floor = m.marginal_threshold - PYRAMID_MARGIN
+        self._fallback_cycles = t.fallback_cycles
+        self._jitter = t.jitter_pct
+        self._sleep_range = (t.min_sleep_seconds, t.max_sleep_seconds)
         
         if not initial:
-            self.log(f"System reloaded. Strategy: {self.cfg.matching.strategy.upper()}", "SUCCESS")
+            self.log(f"System reloaded. Strategy: {self._strategy_label}", "SUCCESS")
             self.log(f"Templates loaded: {len(self.templates)}", "INFO")
 
     def handle_reload(self):
@@ -414,6 +589,9 @@ class NexusBot:
             
             if self.profile != old_profile:
                 self.log(f"Profile switched: {old_profile} -> {self.profile}", "SUCCESS")
+            
+            # Monitor may have changed; capture buffers follow the new frame size
+            self.screen.set_monitor(self.cfg.display.monitor)
                 
             self._reload_systems()
             
@@ -439,26 +617,40 @@ class NexusBot:
         except Exception as e:
             self.log(f"Cycle failed: {e}", "ERROR")
 
-    def smart_sleep(self, duration: float, jitter: float = 0.0):
-        # Responsive sleep - keeps UI alive and checks hotkeys
+    def _next_jitter(self) -> float:
+        # Next pre-drawn uniform value in [-1, 1); the ring is redrawn in one batch when used up
+        i = self._jitter_idx
+        if i == JITTER_BUF_SIZE:
+            self._jitter_buf = self._rng.uniform(-1.0, 1.0, JITTER_BUF_SIZE).tolist()
+            i = 0
+        self._jitter_idx = i + 1
+        return self._jitter_buf[i]
+
+    def smart_sleep(self, duration: float, jitter: float = 0.0, prefetch: bool = False):
+        # Responsive sleep - blocks on the wake event, so hotkeys interrupt it instantly
+        # The dashboard redraws from its own refresh thread, nothing to pump here
+        # prefetch: start the next screen grab PREFETCH_LEAD_SECONDS before waking, so
+        # the caller's capture right after the sleep is already done
         if jitter > 0:
-            duration += duration * random.uniform(-jitter, jitter)
+            duration += duration * jitter * self._next_jitter()
             
         if duration <= 0: return
 
-        end_time = time.time() + duration
-        while time.time() < end_time:
-            # 1. Hotkey Checks
+        end_time = time.monotonic() + duration
+        prefetch = prefetch and self._grayscale
+        while True:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0: break
+            if prefetch and remaining <= PREFETCH_LEAD_SECONDS:
+                self.screen.prefetch_gray()
+                prefetch = False
+            self._wake.wait(remaining - PREFETCH_LEAD_SECONDS if prefetch else remaining)
+            self._wake.clear()
+            
+            # Hotkey Checks (flags outlive the event, so nothing is lost by clearing)
             if self.reload_requested: self.handle_reload()
             if self.cycle_requested: self.handle_cycle()
             if not self.running or self.paused: break
-            
-            # 2. UI Refresh
-            if self.dash: self.dash.update()
-            
-            # 3. Small sleep to prevent CPU spinning
-            # 50ms is fast enough for 20fps UI updates
-            time.sleep(0.05)
 
     def run(self):
         # Main bot loop
@@ -478,9 +670,9 @@ class NexusBot:
                         self.log("PAUSED via Hotkey", "WARN") # Added log
                         self.last_pause_state = True
                     
-                    # Responsive pause loop
-                    self.dash.update()
-                    time.sleep(0.1) 
+                    # Responsive pause loop - sleeps until a hotkey fires
+                    self._wake.wait(IDLE_WAIT_SECONDS)
+                    self._wake.clear()
                     continue
                 
                 if self.last_pause_state:
@@ -492,96 +684,110 @@ class NexusBot:
                 self._tick()
                 
                 # 4. Anti-Burnout Sleep (Responsive)
-                sleep_duration = random.uniform(self.cfg.timing.min_sleep_seconds, self.cfg.timing.max_sleep_seconds)
-                self.smart_sleep(sleep_duration, self.cfg.timing.jitter_pct)
+                lo, hi = self._sleep_range
+                sleep_duration = lo + (hi - lo) * (self._next_jitter() + 1.0) * 0.5
+                self.smart_sleep(sleep_duration, self._jitter, prefetch=True)
                 
         except KeyboardInterrupt:
             pass
         except Exception as e:
             self.log(f"CRITICAL ERROR: {e}", "ERROR")
-            import traceback
             traceback.print_exc()
-            time.sleep(3.0) # Give user time to see it
+            # Give user time to see it. Only the quit hotkey cuts it short: a stale
+            # wake from the crashed tick, or F9/F5/F8 now, just re-arms the wait
+            deadline = time.monotonic() + 3.0
+            self._wake.clear()
+            while self.running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._wake.wait(remaining)
+                self._wake.clear()
         finally:
             self.shutdown()
 
+    def _capture(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # Grab the frame in the format the matcher wants (into ScreenCapture's reused buffers),
+        # plus its gray view in color mode - converted from BGRA in the same grab
+        if self._grayscale:
+            return self.screen.capture_gray(), None
+        return self.screen.capture_with_gray()
+
     def _tick(self):
         # One scan-and-click cycle
         self.dash.stats.inc_cycles()
         self.dash.set_status(Dashboard.STATUS_SCANNING)
         self.dash.set_stealth(False)
-        self.dash.update()
         
-        screenshot = self.screen.capture()
+        screenshot, gray = self._capture()
         self.log(f"Scanning...", "INFO") # Heartbeat log
         
-        # Sort templates based on priority
-        # Priority: stop_ > web_ (if expecting) > others
-        scan_order = list(self.templates.items())
-        def get_priority(name):
-            n = name.lower()
-            if n.startswith("stop_"): return 0
-            if self.expecting_web and n.startswith("web_"): return 1
-            return 2
-            
-        scan_order.sort(key=lambda x: get_priority(x[0]))
-        
-        if self.cfg.timing.fallback_cycles > 0 and self.no_match_streak >= self.cfg.timing.fallback_cycles:
+        # Stop signals first, on their own: worst-case stop latency is one match per
+        # stop template, whatever the profile size
+        prep = self.matcher.prepare_screen(screenshot, gray)  # Shared by both passes
+        stop_hit = self._check_stop_only(screenshot, prep)
+        if stop_hit is not None:
+            self.log(f"STOP SIGNAL: {stop_hit.name}", "SUCCESS")
+            self.log("Collection installation complete. Exiting.", "SUCCESS")
+            self.running = False
+            return
+        
+        # Scan order, prebuilt at reload
+        # Priority: web_ (if expecting) > others
+        scan_order = self._order_web_first if self.expecting_web else self._order_other_first
+        
+        fallback = self._fallback_cycles > 0 and self.no_match_streak >= self._fallback_cycles
+        if fallback:
              self.log(f"Fallback mode: full scan (streak {self.no_match_streak})", "WARN")
-             # Shuffle non-stop templates; stop_ templates stay at the front
-             stop_items = [(n, t) for n, t in scan_order if n.lower().startswith("stop_")]
-             other_items = [(n, t) for n, t in scan_order if not n.lower().startswith("stop_")]
-             random.shuffle(other_items)
-             scan_order = stop_items + other_items
-
-        matched = False
-        
-        # Scan
-        for name, template in scan_order:
-
-            # Update Dash
-            self.dash.set_template(name, self.cfg.matching.strategy.upper())
-            self.dash.update()
-            time.sleep(SCAN_VISUAL_DELAY)
+             scan_order = scan_order[:]  # Copy - the prebuilt list stays intact
+             random.shuffle(scan_order)
+        
+        # Coarse-to-fine: reject templates on a 1/4- (or 1/2-) scale pass, then refine the
+        # survivors at full res around their coarse peak only.
+        # Correlation strategies only, and skipped in fallback so ORB/AKAZE get a full shot.
+        pyramid = None
+        if self._use_pyramid and not fallback:
+            pyramid = self.screen.capture_gray_pyramid()
+
+        hit = None
+        strategy_label = self._strategy_label
+        thresholds = self._kind_thresholds
+        
+        # Scan - one batched call; screen-side prep is shared, templates match in parallel
+        # on the pool, and results come back in priority order until we break.
+        for template, result in self.matcher.match_many(scan_order, screenshot, pyramid, self._coarse_floor,
+                                                        executor=self._match_pool, prep=prep):
+            # Update Dash - the refresh thread picks the target up on its next frame
+            self.dash.set_template(template.name, strategy_label)
             
-            # Match
-            # Use appropriate threshold
-            if name.lower().startswith("stop_"):
-                # High confidence for stop signals to avoid false positives
-                thresh = 0.85
-            else:
-                 thresh = self.cfg.matching.confidence_threshold
-
-            result = self.matcher.match(template, screenshot, name)
-            
-            if result.found and result.confidence >= thresh:
-                if name.lower().startswith("stop_"):
-                    self.log(f"STOP SIGNAL: {name}", "SUCCESS")
-                    self.log("Collection installation complete. Exiting.", "SUCCESS")
-                    self.running = False
-                    return
-
-                self._handle_match(name, result)
-                matched = True
+            # Threshold by kind
+            if result.found and result.confidence >= thresholds[template.kind]:
+                hit = (template, result)
                 break
-            
-            # Allow UI update during heavy scanning
-            self.dash.update()
         
-        if not matched:
+        if hit is None:
             self.no_match_streak += 1
-        else:
-            self.no_match_streak = 0
+            return
+        
+        template, result = hit
+        self.no_match_streak = 0
+        self._handle_match(template, result)
 
-    def _handle_match(self, name: str, result: Any):
+    def _check_stop_only(self, screenshot: np.ndarray, prep: Any = None) -> Optional[TemplateEntry]:
+        # Synchronous stop-signal pass (typically 1-2 templates, never coarse-rejected)
+        for template, result in self.matcher.match_many(self._stop_items, screenshot, prep=prep):
+            if result.found and result.confidence >= STOP_CONFIDENCE:
+                return template
+        return None
+
+    def _handle_match(self, entry: TemplateEntry, result: MatchResult):
         # Handle click on found target
         self.dash.stats.inc_matches()
         
         algo = result.algorithm.upper() if result.algorithm else "?"
-        self.log(f"Match: {name} [{algo}] ({result.confidence:.2f})", "SUCCESS")
+        self.log(f"Match: {entry.name} [{algo}] ({result.confidence:.2f})", "SUCCESS")
         
         self.dash.set_stealth(True, "Approaching Target")
-        self.dash.update()
         
         # Coordinate Logic
         cx, cy = result.center
@@ -598,37 +804,48 @@ class NexusBot:
         x, y = self.mouse.move_and_click(cx, cy, return_home=False)
         
         self.dash.stats.inc_clicks()
-        self.dash.stats.save()
         self.log(f"Click executed @ {x},{y}", "CLICK")
         
         # Post-Click State Updates
-        if name.lower().startswith("web_"):
+        if entry.kind == KIND_WEB:
             self.expecting_web = False
             self.log(f"Web clicked. Waiting {self.cfg.timing.web_click_delay}s", "INFO")
-            self.smart_sleep(self.cfg.timing.web_click_delay, self.cfg.timing.jitter_pct)
+            self.smart_sleep(self.cfg.timing.web_click_delay, self._jitter)
             
             # Verification: Check for "Your download has started"
-            verify_template = next((k for k in self.templates.keys() if k.startswith("web_download_started")), None)
+            verify_entry = self._verify_entry
             
-            if verify_template:
+            if verify_entry:
                 self.log("Verifying download text...", "INFO")
                 self.dash.set_template("Verifying...", "TEXT_CHECK")
-                self.dash.update()
                 
-                start_verify = time.time()
+                deadline = time.monotonic() + self.cfg.timing.download_verify_timeout
                 verified = False
+                prepared = None
+                use_fft = self.matcher.fft_verify
+                delay = VERIFY_POLL_MIN
                 
-                while time.time() - start_verify < self.cfg.timing.download_verify_timeout:
-                    scr = self.screen.capture()
-                    # High confidence needed for text
-                    res = self.matcher.match(self.templates[verify_template], scr, verify_template)
+                while time.monotonic() < deadline:
+                    if use_fft:
+                        scr = self.screen.capture_gray()  # FFT check is gray-only, whatever the mode
+                        # Template spectrum is built once on the first frame, then reused per poll
+                        if prepared is None:
+                            prepared = self.matcher.prepare_fft(verify_entry, scr.shape[:2])
+                        res = self.matcher.match_prepared(prepared, scr)
+                    else:
+                        # Configured matcher (incl. ORB/AKAZE), on a frame in its mode
+                        scr, _ = self._capture()
+                        res = self.matcher.match(verify_entry, scr)
                     
+                    # High confidence needed for text
                     if res.found and res.confidence >= 0.85:
                         self.log("Download CONFIRMED.", "SUCCESS")
                         verified = True
                         break
                         
-                    self.smart_sleep(0.5)
+                    # Poll fast first (most confirmations land early), backing off to bound CPU
+                    self.smart_sleep(min(delay, max(0.0, deadline - time.monotonic())), prefetch=True)
+                    delay = min(delay * VERIFY_POLL_GROWTH, VERIFY_POLL_MAX)
                     
                 if not verified:
                     self.log("Download verification TIMEOUT. Closing anyway.", "WARN")
@@ -636,15 +853,18 @@ class NexusBot:
             # FOCUS CLICK: Ensure browser is focused before Ctrl+W
             # Click exactly where we are (in place) to regain focus
             self.log("Focusing window (Click-in-place)", "INFO")
-            pyautogui.click()
-
             self.log(f"Closing tab ({self.cfg.hotkeys.close_tab})", "INFO")
-            pyautogui.hotkey(*self.cfg.hotkeys.close_tab.split('+'))
+            if self._close_tab_batch is not None:
+                failsafe_check()  # SendInput bypasses pyautogui's corner failsafe
+                send_input_batch(self._close_tab_batch)
+            else:
+                pyautogui.click()
+                keyboard.send(self.cfg.hotkeys.close_tab)
         else:
             self.expecting_web = True
             self.log(f"Vortex detected. Expecting browser...", "INFO")
             # Use smart_sleep here too
-            self.smart_sleep(self.cfg.timing.vortex_launch_delay, self.cfg.timing.jitter_pct)
+            self.smart_sleep(self.cfg.timing.vortex_launch_delay, self._jitter)
 
     def shutdown(self):
         # Unregister hotkeys
@@ -652,14 +872,17 @@ class NexusBot:
             keyboard.unhook_all()
         except Exception:
             pass
-        # Close screen capture handle
-        if self.screen and self.screen._sct:
+        # Close screen capture handles (and the prefetch thread)
+        if self.screen:
             try:
-                self.screen._sct.close()
-                self.screen._sct = None
+                self.screen.close()
             except Exception:
                 pass
+        self._match_pool.shutdown(wait=False, cancel_futures=True)
         if self.dash:
+            # Final save inline - the periodic saver is a daemon and may be mid-sleep
+            self.dash.stats.stop_saver()
+            self.dash.stats.save()
             self.dash.stop()
         print("\nExiting Nexus-AutoDL...")
 
@@ -1,14 +1,33 @@
 # src package - vision, input, ui, config
+# Submodules load on first attribute access (PEP 562), so importing the config
+# side doesn't drag in OpenCV, mss, pyautogui and rich
 
-from .vision import ScreenCapture, TemplateMatcher, MatchResult
-from .human_input import HumanMouse, Point
-from .ui import Dashboard, Stats, make_logger, VERSION
-from .config import AppConfig, load_config
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "ScreenCapture": ".vision", "TemplateMatcher": ".vision", "TemplateEntry": ".vision",
+    "MatchResult": ".vision", "make_matcher": ".vision",
+    "HumanMouse": ".human_input", "Point": ".human_input",
+    "Dashboard": ".ui", "Stats": ".ui", "make_logger": ".ui", "VERSION": ".ui",
+    "AppConfig": ".config", "load_config": ".config",
+}
 
 __all__ = [
     "VERSION",
-    "ScreenCapture", "TemplateMatcher", "MatchResult",
+    "ScreenCapture", "TemplateMatcher", "TemplateEntry", "MatchResult", "make_matcher",
     "HumanMouse", "Point",
     "Dashboard", "Stats", "make_logger",
     "AppConfig", "load_config"
 ]
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
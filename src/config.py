@@ -3,11 +3,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Tuple, Optional
-
-import yaml
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Tuple, Optional
 
 
 # --- Mouse Movement ---
@@ -15,35 +16,35 @@ import yaml
 # Humans are sloppy, shaky, and overshoot targets. Embrace the chaos.
 
 
-@dataclass
+@dataclass(slots=True)
 class MouseConfig:
     # Mouse movement config - don't mess with these unless you know what you're doing
     
     # How many points on the bezier curve. More = smoother but slower.
-    # 50 is smooth enough. Drop to 30 if you're impatient.
-    curve_resolution: int = 50
+    # 60 is smooth. Drop to 30 if you're impatient.
+    curve_resolution: int = 60
     
     # Speed multiplier. 1.0 = normal. 0.5 = grandma mode. 1.5 = twitchy.
     # Stay under 1.2 unless you want to look like you've had 8 espressos.
-    speed_factor: float = 1.0
+    speed_factor: float = 0.9
     
     # Overshoot: sometimes "miss" the target and correct back.
     # Real humans do this constantly. Disabling = instant red flag.
     overshoot_enabled: bool = True
-    overshoot_probability: float = 0.25  # 25% chance per click
-    overshoot_distance: Tuple[int, int] = (3, 10)  # pixels past target
-    overshoot_delay_ms: int = 50  # pause before correction
+    overshoot_probability: float = 0.20  # 20% chance per click
+    overshoot_distance: Tuple[int, int] = (4, 12)  # pixels past target
+    overshoot_delay_ms: int = 60  # pause before correction
     
     # Jitter: tiny random wobbles simulating hand tremor.
     # Not coffee jitters - more like "I'm a human holding a mouse" jitters.
     jitter_enabled: bool = True
-    jitter_amplitude: float = 1.2  # pixels of shake
-    jitter_frequency: float = 0.30  # 30% of movements get the shake
+    jitter_amplitude: float = 1.5  # pixels of shake
+    jitter_frequency: float = 0.25  # 25% of path points get the shake
     
     # Click offset: like throwing darts - most land near bullseye,
     # but some drift toward the edges. Perfect bullseyes = bot behavior.
     click_offset_enabled: bool = True
-    click_offset_ratio: float = 0.30  # Max offset (0.30 = up to 30% from center)
+    click_offset_ratio: float = 0.35  # Max offset (0.35 = up to 35% from center)
 
 
 
@@ -52,7 +53,7 @@ class MouseConfig:
 # Too low = clicks random garbage that kinda looks like buttons.
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchingConfig:
     # How confident the bot needs to be before clicking
     
@@ -77,6 +78,17 @@ class MatchingConfig:
     #   "akaze"    - AKAZE features only (slowest, most reliable)
     # Cascade is smart - it starts fast and falls back to slower methods if needed.
     strategy: str = "cascade"
+    
+    # Correlation score for the template step:
+    #   "ccoeff" - Mean-subtracted (default). Shrugs off brightness/theme shifts.
+    #   "ccorr"  - Somewhat cheaper, but bright flat areas score high. Raise thresholds if you use it.
+    #   "sqdiff" - Pixel-difference based, about as costly as ccoeff. Needs near-identical buttons.
+    correlation: str = "ccoeff"
+    
+    # Search regions: template name -> (x, y, width, height) in monitor pixels.
+    # A template with a region is only ever looked for inside that box - much cheaper
+    # than scanning the whole screen. Templates not listed are searched everywhere.
+    regions: Dict[str, Tuple[int, int, int, int]] = field(default_factory=dict)
 
 
 
@@ -85,14 +97,14 @@ class MatchingConfig:
 # why Nexus shows them the door. Randomization is your friend.
 
 
-@dataclass 
+@dataclass(slots=True)
 class TimingConfig:
     # Timing delays - don't set these to zero or you'll get banned
     
     # Main loop sleep. Random between min and max.
-    # 1.0-2.5s is brisk but human. Under 0.5 = sus.
-    min_sleep_seconds: float = 1.0
-    max_sleep_seconds: float = 2.5
+    # 1.5-4.0s is unhurried but human. Under 0.5 = sus.
+    min_sleep_seconds: float = 1.5
+    max_sleep_seconds: float = 4.0
     
     # After clicking Vortex button, browser needs time to open.
     # Modern browsers are fast - 3.5s is usually enough.
@@ -107,9 +119,9 @@ class TimingConfig:
     jitter_pct: float = 0.20
     
     # Hesitation before clicking. Humans don't click instantly.
-    # They see the button, brain processes, hand moves. 50-180ms is realistic.
-    hesitation_min_ms: int = 50
-    hesitation_max_ms: int = 180
+    # They see the button, brain processes, hand moves. 80-250ms is realistic.
+    hesitation_min_ms: int = 80
+    hesitation_max_ms: int = 250
     
     # Template fallback: after this many cycles without ANY match on priority templates,
     # the bot will try ALL templates in the folder regardless of naming convention.
@@ -127,7 +139,7 @@ class TimingConfig:
 # run at 1440p, nothing will match. Bot will sit there doing nothing.
 
 
-@dataclass
+@dataclass(slots=True)
 class DisplayConfig:
     # Monitor config - must match your template screenshots
     
@@ -143,7 +155,7 @@ class DisplayConfig:
 # Cosmetic stuff. Won't get you banned but might save your eyes at 2am.
 
 
-@dataclass
+@dataclass(slots=True)
 class UIConfig:
     # UI settings
     
@@ -161,7 +173,7 @@ class UIConfig:
 # When things go sideways, you'll want these memorized.
 
 
-@dataclass
+@dataclass(slots=True)
 class HotkeysConfig:
     # Hotkeys - memorize these
     
@@ -182,13 +194,13 @@ class HotkeysConfig:
     # CASCADE -> TEMPLATE -> ORB -> AKAZE -> CASCADE...
     cycle_strategy: str = "f8"
 
-@dataclass
+@dataclass(slots=True)
 class ProfilesConfig:
     # Profile paths
     root_directory: str = "profiles"
     active_profile: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class VisualConfig:
     # Debug settings
     debug_mode: bool = False
@@ -196,7 +208,7 @@ class VisualConfig:
 # --- Master Config ---
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     # Main config - bundles everything together
     # Use load_config() to create this
@@ -214,106 +226,233 @@ class AppConfig:
 # --- Config Loader ---
 
 
-def _get(data: dict, *keys, default=None):
-    # Safe nested dict access without KeyErrors
-    for key in keys:
-        if not isinstance(data, dict):
-            return default
-        data = data.get(key)
-        if data is None:
-            return default
-    return data
+# YAML layout -> dataclass fields, resolved once per key group instead of a
+# full dict walk per key. Each group: key path to a YAML mapping, then its
+# fields - a bare name when the YAML key matches, else (field, key); a tuple
+# key builds a tuple field from several keys. Defaults come from the dataclasses.
+_LAYOUT = (
+    ("display", DisplayConfig, (
+        (("display",), ("expected_width", "expected_height", "monitor")),
+    )),
+    ("matching", MatchingConfig, (
+        (("matching",), (
+            "confidence_threshold", "marginal_threshold", "use_grayscale", "strategy", "correlation",
+            "regions",
+        )),
+    )),
+    ("timing", TimingConfig, (
+        (("timing",), (
+            "min_sleep_seconds", "max_sleep_seconds", "vortex_launch_delay", "web_click_delay",
+            "jitter_pct", "hesitation_min_ms", "hesitation_max_ms", "fallback_cycles",
+            "download_verify_timeout",
+        )),
+    )),
+    ("mouse", MouseConfig, (
+        (("mouse",), ("curve_resolution", "speed_factor")),
+        (("mouse", "overshoot"), (
+            ("overshoot_enabled", "enabled"),
+            ("overshoot_probability", "probability"),
+            ("overshoot_distance", ("distance_min_px", "distance_max_px")),
+            ("overshoot_delay_ms", "correction_delay_ms"),
+        )),
+        (("mouse", "jitter"), (
+            ("jitter_enabled", "enabled"),
+            ("jitter_amplitude", "amplitude_px"),
+            ("jitter_frequency", "frequency"),
+        )),
+        (("mouse", "click_offset"), (
+            ("click_offset_enabled", "enabled"),
+            ("click_offset_ratio", "ratio"),
+        )),
+    )),
+    ("ui", UIConfig, (
+        (("ui",), ("night_mode", ("night_mode_hour", "night_mode_start_hour"), "refresh_rate_ms")),
+    )),
+    ("hotkeys", HotkeysConfig, (
+        (("hotkeys",), ("close_tab", "stop_bot", "pause_bot", "reload_bot", "cycle_strategy")),
+    )),
+    ("profiles", ProfilesConfig, (
+        (("profiles",), (("root_directory", "profiles_dir"), "active_profile")),
+    )),
+    ("visual", VisualConfig, (
+        (("visual",), ("debug_mode",)),
+    )),
+)
+
+
+def _build_schema():
+    # Expand _LAYOUT into (attr, cls, ((path, ((field, key, default), ...)), ...)) rows
+    schema = []
+    for attr, cls, groups in _LAYOUT:
+        defaults = cls()
+        resolved = []
+        for path, names in groups:
+            rows = []
+            for item in names:
+                name, key = (item, item) if isinstance(item, str) else item
+                rows.append((name, key, getattr(defaults, name)))
+            resolved.append((path, tuple(rows)))
+        schema.append((attr, cls, tuple(resolved)))
+    return tuple(schema)
+
+
+_SCHEMA = _build_schema()
+
+# Field defaults per key group, for groups missing from the YAML
+_GROUP_DEFAULTS = {
+    path: {name: default for name, _key, default in rows}
+    for _attr, _cls, groups in _SCHEMA
+    for path, rows in groups
+}
+
+# All field defaults per section
+_SECTION_DEFAULTS = {
+    attr: {name: default for _path, rows in groups for name, _key, default in rows}
+    for attr, _cls, groups in _SCHEMA
+}
+
+# Sidecar format version: bump when the meaning of a stored config changes without
+# the field layout changing (e.g. new _validate rules)
+_SIDECAR_VERSION = 1
+# Fingerprint of the field layout (sections, fields, YAML keys, defaults) stored in
+# every sidecar, so one written before a field was added or a default moved is
+# re-parsed instead of filling the new field with its default
+_SIDECAR_SCHEMA = hashlib.sha256(repr((_SIDECAR_VERSION, [
+    (attr, [(path, rows) for path, rows in groups]) for attr, _cls, groups in _SCHEMA
+])).encode()).hexdigest()
+
+
+# Parsed configs by absolute path -> ((mtime_ns, size), sha256, AppConfig), most recent last.
+# An unchanged file (F5 mashing) skips YAML entirely and gets a copy; a touched
+# but identical file (editor save without edits) costs a read + hash, still no parse.
+_CONFIG_CACHE: "OrderedDict[str, Tuple[Tuple[int, int], bytes, AppConfig]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 8
 
 
 def load_config(path: str = "config.yaml") -> AppConfig:
-    # Load config from YAML file with fallback handling
-    config_path = Path(path)
-    
-    if not config_path.exists():
+    # Load config from YAML file with fallback handling, cached on (mtime, size) then content hash
+    # The one stat doubles as the existence check; the key is a plain abspath
+    # since resolve() would walk/lstat every path component again
+    try:
+        st = os.stat(path)
+    except OSError:
         return AppConfig()  # No config found, using defaults.
     
+    key = os.path.abspath(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        _CONFIG_CACHE.move_to_end(key)
+        return _copy_config(cached[2])
+    
+    # Cold start: the JSON sidecar from a previous run skips YAML if the stamp still matches
+    sidecar = None if cached is not None else _read_sidecar(path, stamp)
+    if sidecar is not None:
+        digest, cfg = sidecar
+    else:
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return AppConfig()
+        digest = hashlib.sha256(raw).digest()
+        if cached is not None and cached[1] == digest:
+            cfg = cached[2]  # Same bytes, new stamp - keep the parsed config
+        else:
+            cfg = _parse_config(raw)
+            _write_sidecar(path, stamp, digest, cfg)
+    _CONFIG_CACHE[key] = (stamp, digest, cfg)
+    _CONFIG_CACHE.move_to_end(key)
+    while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
+    # Callers mutate their config (strategy cycling), so never hand out the cached one
+    return _copy_config(cfg)
+
+
+def _copy_config(cfg: AppConfig) -> AppConfig:
+    # Sections hold immutable values apart from matching.regions (a dict of tuples),
+    # so a shallow copy per section plus a copy of that dict is a full copy -
+    # ~7x cheaper than deepcopy on the F5 hit path
+    out = AppConfig(**{attr: replace(getattr(cfg, attr)) for attr, _cls, _groups in _SCHEMA})
+    out.matching.regions = dict(out.matching.regions)
+    return out
+
+
+def _sidecar_path(path: str) -> str:
+    return path + ".cache"
+
+
+def _read_sidecar(path: str, stamp: Tuple[int, int]) -> Optional[Tuple[bytes, AppConfig]]:
+    # Parsed config saved next to the YAML as JSON, keyed by the source's (mtime_ns, size)
+    # and only trusted when it was written for this exact schema
+    try:
+        with open(_sidecar_path(path), "rb") as f:
+            data = json.loads(f.read())
+        if data.get("schema") != _SIDECAR_SCHEMA or tuple(data["stamp"]) != stamp:
+            return None
+        sections = data["config"]
+        kwargs = {}
+        for attr, cls, _groups in _SCHEMA:
+            values = sections[attr]
+            # JSON has no tuples - put back the tuple-typed fields (overshoot_distance)
+            defaults = _SECTION_DEFAULTS[attr]
+            for name, default in defaults.items():
+                if isinstance(default, tuple) and name in values:
+                    values[name] = tuple(values[name])
+            kwargs[attr] = cls(**values)
+        cfg = AppConfig(**kwargs)
+        _validate(cfg)
+        return bytes.fromhex(data["sha256"]), cfg
+    except (OSError, ValueError, KeyError, TypeError):
+        return None  # Missing, stale or hand-mangled sidecar: just parse the YAML
+
+
+def _write_sidecar(path: str, stamp: Tuple[int, int], digest: bytes, cfg: AppConfig) -> None:
+    # Best effort - a read-only install dir just means no sidecar
+    payload = {"schema": _SIDECAR_SCHEMA, "stamp": list(stamp), "sha256": digest.hex(), "config": asdict(cfg)}
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        with open(_sidecar_path(path), "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def _parse_config(raw: bytes) -> AppConfig:
+    # Parse and validate one YAML document, falling back to defaults when malformed
+    # PyYAML is imported here, on the first real parse, so importing this module
+    # for the dataclasses (or loading from a sidecar) never pays for it
+    import yaml
+    # libyaml's C parser when PyYAML was built with it, pure-Python SafeLoader otherwise
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    try:
+        data = yaml.load(raw.decode("utf-8"), Loader=loader) or {}
     except Exception:
         return AppConfig()  # Malformed YAML fallback.
     
-    # Build config from YAML with fallbacks
-    display = DisplayConfig(
-        expected_width=_get(data, "display", "expected_width", default=1920),
-        expected_height=_get(data, "display", "expected_height", default=1080),
-        monitor=_get(data, "display", "monitor", default=1)
-    )
-    
-    matching = MatchingConfig(
-        confidence_threshold=_get(data, "matching", "confidence_threshold", default=0.80),
-        marginal_threshold=_get(data, "matching", "marginal_threshold", default=0.60),
-        use_grayscale=_get(data, "matching", "use_grayscale", default=True),
-        strategy=_get(data, "matching", "strategy", default="cascade")
-    )
-    
-    timing = TimingConfig(
-        min_sleep_seconds=_get(data, "timing", "min_sleep_seconds", default=1.5),
-        max_sleep_seconds=_get(data, "timing", "max_sleep_seconds", default=4.0),
-        vortex_launch_delay=_get(data, "timing", "vortex_launch_delay", default=5.0),
-        web_click_delay=_get(data, "timing", "web_click_delay", default=1.5),
-        jitter_pct=_get(data, "timing", "jitter_pct", default=0.15),
-        hesitation_min_ms=_get(data, "timing", "hesitation_min_ms", default=80),
-        hesitation_max_ms=_get(data, "timing", "hesitation_max_ms", default=250),
-        fallback_cycles=_get(data, "timing", "fallback_cycles", default=4),
-        download_verify_timeout=_get(data, "timing", "download_verify_timeout", default=10.0)
-    )
-    
-    overshoot = _get(data, "mouse", "overshoot", default={})
-    jitter = _get(data, "mouse", "jitter", default={})
-    click_offset = _get(data, "mouse", "click_offset", default={})
-    
-    mouse = MouseConfig(
-        curve_resolution=_get(data, "mouse", "curve_resolution", default=60),
-        speed_factor=_get(data, "mouse", "speed_factor", default=0.9),
-        overshoot_enabled=overshoot.get("enabled", True),
-        overshoot_probability=overshoot.get("probability", 0.20),
-        overshoot_distance=(
-            overshoot.get("distance_min_px", 4),
-            overshoot.get("distance_max_px", 12)
-        ),
-        overshoot_delay_ms=overshoot.get("correction_delay_ms", 60),
-        jitter_enabled=jitter.get("enabled", True),
-        jitter_amplitude=jitter.get("amplitude_px", 1.5),
-        jitter_frequency=jitter.get("frequency", 0.25),
-        click_offset_enabled=click_offset.get("enabled", True),
-        click_offset_ratio=click_offset.get("ratio", 0.35)
-    )
-    
-    ui = UIConfig(
-        night_mode=_get(data, "ui", "night_mode", default="always"),
-        night_mode_hour=_get(data, "ui", "night_mode_start_hour", default=20),
-        refresh_rate_ms=_get(data, "ui", "refresh_rate_ms", default=100)
-    )
-    
-    hotkeys = HotkeysConfig(
-        close_tab=_get(data, "hotkeys", "close_tab", default="ctrl+w"),
-        stop_bot=_get(data, "hotkeys", "stop_bot", default="f10"),
-        pause_bot=_get(data, "hotkeys", "pause_bot", default="f9"),
-        reload_bot=_get(data, "hotkeys", "reload_bot", default="f5"),
-        cycle_strategy=_get(data, "hotkeys", "cycle_strategy", default="f8")
-    )
-    
-    cfg = AppConfig(
-        display=display,
-        matching=matching,
-        timing=timing,
-        mouse=mouse,
-        ui=ui,
-        hotkeys=hotkeys,
-        profiles=ProfilesConfig(
-            root_directory=_get(data, "profiles", "profiles_dir", default="profiles"),
-            active_profile=_get(data, "profiles", "active_profile", default="")
-        ),
-        visual=VisualConfig(
-            debug_mode=_get(data, "visual", "debug_mode", default=False)
-        )
-    )
+    # Build config from YAML with fallbacks (missing or null keys take the default)
+    sections = {}
+    for attr, cls, groups in _SCHEMA:
+        kwargs = {}
+        for path, rows in groups:
+            node = data
+            for key in path:
+                node = node.get(key) if isinstance(node, dict) else None
+            if not isinstance(node, dict):
+                # Section left out (common for the mouse sub-blocks): take the
+                # group's defaults wholesale instead of a .get per key
+                kwargs.update(_GROUP_DEFAULTS[path])
+                continue
+            get = node.get
+            for name, key, default in rows:
+                if isinstance(key, tuple):
+                    vals = [get(k) for k in key]
+                    kwargs[name] = tuple(d if v is None else v for v, d in zip(vals, default))
+                else:
+                    val = get(key)
+                    kwargs[name] = default if val is None else val
+        sections[attr] = cls(**kwargs)
+    
+    cfg = AppConfig(**sections)
     _validate(cfg)
     return cfg
 
@@ -330,6 +469,9 @@ def _validate(cfg: AppConfig) -> None:
     cfg.matching.marginal_threshold = max(0.05, min(cfg.matching.confidence_threshold, cfg.matching.marginal_threshold))
     if cfg.matching.strategy not in ("cascade", "template", "orb", "akaze"):
         cfg.matching.strategy = "cascade"
+    if cfg.matching.correlation not in ("ccoeff", "ccorr", "sqdiff"):
+        cfg.matching.correlation = "ccoeff"
+    cfg.matching.regions = _clean_regions(cfg.matching.regions)
 
     # Timing (no negative/zero delays)
     cfg.timing.min_sleep_seconds = max(0.1, cfg.timing.min_sleep_seconds)
@@ -354,3 +496,17 @@ def _validate(cfg: AppConfig) -> None:
     cfg.ui.refresh_rate_ms = max(50, min(2000, cfg.ui.refresh_rate_ms))
     cfg.ui.night_mode_hour = max(0, min(23, cfg.ui.night_mode_hour))
 
+
+def _clean_regions(raw) -> Dict[str, Tuple[int, int, int, int]]:
+    # Keep well-formed name -> [x, y, w, h] entries (positive size), drop the rest
+    regions = {}
+    if not isinstance(raw, dict):
+        return regions
+    for name, box in raw.items():
+        try:
+            x, y, w, h = (int(v) for v in box)
+        except (TypeError, ValueError):
+            continue
+        if w > 0 and h > 0:
+            regions[str(name)] = (max(0, x), max(0, y), w, h)
+    return regions
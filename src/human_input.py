@@ -1,45 +1,143 @@
 # Mouse control with bezier curves
 
+import sys
 import time
 import random
 import math
+import functools
+import numpy as np
 import pyautogui
 from dataclasses import dataclass
-from typing import Tuple, List, Optional, Callable
+from typing import Tuple, Optional, Callable, Sequence
 
 # Disable pyautogui fail-safe if you want, but be careful
 pyautogui.FAILSAFE = True
 
-@dataclass
+# Raw Win32 SendInput, so a click + key chord goes out as one injected batch
+# instead of a pyautogui call (and hook round-trip) per event
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _ULONG_PTR = ctypes.c_size_t
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", _ULONG_PTR)]
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", _ULONG_PTR)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+    class _INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    _SendInput = ctypes.windll.user32.SendInput
+    _SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+    _SendInput.restype = wintypes.UINT
+
+    # Cursor moves go straight to user32 too - pyautogui.moveTo does a size
+    # lookup, validation and failsafe check on each of the ~60 steps
+    # (the failsafe is checked by hand instead, see failsafe_check)
+    _SetCursorPos = ctypes.windll.user32.SetCursorPos
+    _SetCursorPos.argtypes = (ctypes.c_int, ctypes.c_int)
+    _SetCursorPos.restype = wintypes.BOOL
+
+    def _move_cursor(x: float, y: float) -> None:
+        _SetCursorPos(int(x), int(y))
+else:
+    _SendInput = None
+
+    def _move_cursor(x: float, y: float) -> None:
+        pyautogui.moveTo(x, y, _pause=False)
+
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+_KEYEVENTF_EXTENDEDKEY = 0x0001
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_SCANCODE = 0x0008
+
+def failsafe_check() -> None:
+    # pyautogui's corner failsafe, for the raw SetCursorPos/SendInput paths that bypass it:
+    # raise FailSafeException while the cursor sits on a failsafe point
+    if pyautogui.FAILSAFE and tuple(pyautogui.position()) in pyautogui.FAILSAFE_POINTS:
+        raise pyautogui.FailSafeException(
+            "PyAutoGUI fail-safe triggered from mouse moving to a corner of the screen"
+        )
+
+def build_click_and_keys(scan_codes: Sequence[int]):
+    # Pre-built SendInput batch: left click in place, then the key chord
+    # (downs in order, ups reversed). None when SendInput isn't available.
+    if _SendInput is None or not scan_codes:
+        return None
+    events = []
+    for flags in (_MOUSEEVENTF_LEFTDOWN, _MOUSEEVENTF_LEFTUP):
+        ev = _INPUT(type=_INPUT_MOUSE)
+        ev.u.mi.dwFlags = flags
+        events.append(ev)
+    keys = []
+    for code in scan_codes:
+        # keyboard reports extended keys as 0xE0xx
+        flags = _KEYEVENTF_SCANCODE | (_KEYEVENTF_EXTENDEDKEY if code > 0xFF else 0)
+        keys.append((code & 0xFF, flags))
+    for code, flags in keys:
+        ev = _INPUT(type=_INPUT_KEYBOARD)
+        ev.u.ki.wScan = code
+        ev.u.ki.dwFlags = flags
+        events.append(ev)
+    for code, flags in reversed(keys):
+        ev = _INPUT(type=_INPUT_KEYBOARD)
+        ev.u.ki.wScan = code
+        ev.u.ki.dwFlags = flags | _KEYEVENTF_KEYUP
+        events.append(ev)
+    return (_INPUT * len(events))(*events)
+
+def send_input_batch(batch) -> int:
+    # Inject a batch from build_click_and_keys; returns how many events went through.
+    # Callers run failsafe_check() first - SendInput doesn't look at the cursor
+    return _SendInput(len(batch), batch, ctypes.sizeof(_INPUT))
+
+# Adaptive move_to sampling: at least this many steps, otherwise one per this many pixels
+MIN_MOVE_STEPS = 8
+PX_PER_MOVE_STEP = 6
+# Failsafe corner check every this many cursor steps (and once before the move)
+FAILSAFE_CHECK_STEPS = 8
+
+@dataclass(slots=True)
 class Point:
     x: float
     y: float
 
-def pascal_row(n: int) -> List[int]:
-    # Generate Pascal's triangle row for bezier math
+@functools.lru_cache(maxsize=32)
+def pascal_row(n: int) -> Tuple[int, ...]:
+    # Generate Pascal's triangle row for bezier math (cached, hence a tuple)
     result = [1]
     x = 1
     for i in range(1, n + 1):
         x = x * (n - i + 1) // i
         result.append(x)
-    return result
+    return tuple(result)
 
-def make_bezier(control_points: List[Point]) -> Callable[[float], Point]:
-    # Build bezier curve function from control points
-    n = len(control_points) - 1
-    combinations = pascal_row(n)
-    
-    def bezier(t: float) -> Point:
-        # Bernstein polynomials
-        result_x = 0.0
-        result_y = 0.0
-        for i, point in enumerate(control_points):
-            bernstein = combinations[i] * (t ** i) * ((1 - t) ** (n - i))
-            result_x += point.x * bernstein
-            result_y += point.y * bernstein
-        return Point(result_x, result_y)
-    
-    return bezier
+def ease_in_out(t: np.ndarray) -> np.ndarray:
+    # easeInOutQuad over a whole t-grid
+    return np.where(t < 0.5, 2 * t * t, -1 + (4 - 2 * t) * t)
+
+def bezier_basis(n: int, t: np.ndarray) -> np.ndarray:
+    # Bernstein basis for every t as a [len(t), n+1] matrix
+    if n == 3:
+        # Cubic (the only order move_to uses), unrolled - no binomials or powers
+        omt = 1 - t
+        omt2 = omt * omt
+        t2 = t * t
+        return np.stack([omt2 * omt, 3 * omt2 * t, 3 * omt * t2, t2 * t], axis=1)
+    combinations = np.asarray(pascal_row(n), dtype=np.float64)
+    i = np.arange(n + 1)
+    return combinations * (t[:, None] ** i) * ((1 - t)[:, None] ** (n - i))
 
 class HumanMouse:
     # Mouse controller with bezier curves, variable speed, and jitter
@@ -67,6 +165,18 @@ class HumanMouse:
         self.over_delay = overshoot_delay
         self.hesitate_rng = hesitate_range
         self.callback = stealth_callback or (lambda x: None)
+        # Per-move randomness is drawn in bulk from here (SFC64 is the fastest bit generator)
+        self._rng = np.random.Generator(np.random.SFC64())
+        # Eased cubic basis per step count, built on first use;
+        # each move is then just [steps+1, 4] @ [4, 2]
+        self._bases = {}
+        
+    def _basis(self, steps: int) -> np.ndarray:
+        basis = self._bases.get(steps)
+        if basis is None:
+            basis = bezier_basis(3, ease_in_out(np.linspace(0.0, 1.0, steps + 1)))
+            self._bases[steps] = basis
+        return basis
         
     def _pos(self) -> Point:
         x, y = pyautogui.position()
@@ -88,18 +198,15 @@ class HumanMouse:
         # Determine control points for arc
         # Random offsets scaled by distance
         offset = min(dist * 0.5, 400.0) 
-        c1 = Point(
-            start.x + random.uniform(-offset, offset),
-            start.y + random.uniform(-offset, offset)
-        )
-        c2 = Point(
-            end.x + random.uniform(-offset, offset),
-            end.y + random.uniform(-offset, offset)
-        )
+        ox1, oy1, ox2, oy2 = self._rng.uniform(-offset, offset, 4).tolist()
         
-        # Control points
-        points = [start, c1, c2, end]
-        curve = make_bezier(points)
+        # Control points (start, c1, c2, end) as one [4, 2] array
+        points = np.array([
+            (start.x, start.y),
+            (start.x + ox1, start.y + oy1),
+            (end.x + ox2, end.y + oy2),
+            (end.x, end.y)
+        ], dtype=np.float64)
         
         # Duration based on distance if not provided
         if duration <= 0:
@@ -109,36 +216,39 @@ class HumanMouse:
         
         self.callback("Moving")
         
-        # Execute movement
-        steps = self.res
-        start_time = time.time()
+        # Step count scales with distance (one per PX_PER_MOVE_STEP, capped at res):
+        # a short hop doesn't need 60 cursor updates to look smooth
+        steps = max(MIN_MOVE_STEPS, min(self.res, int(dist / PX_PER_MOVE_STEP)))
         
-        for i in range(steps + 1):
-            t = i / steps
-            
-            # Easing: easeInOutQuad or similar
-            # t_eased = t * t * (3 - 2 * t) # smoothstep
-            # Cleaner acceleration
-            if t < 0.5:
-                t_eased = 2 * t * t
-            else:
-                t_eased = -1 + (4 - 2 * t) * t
-                
-            pos = curve(t_eased)
-            
-            # Add jitter
-            if self.jitter_amp > 0 and random.random() < self.jitter_freq:
-                pos.x += random.uniform(-self.jitter_amp, self.jitter_amp)
-                pos.y += random.uniform(-self.jitter_amp, self.jitter_amp)
-            
+        # Whole path up front: every curve sample in one product against the
+        # cached basis instead of a Python bezier call per step
+        path = self._basis(steps) @ points
+        xs = path[:, 0]
+        ys = path[:, 1]
+        
+        # Add jitter: pick the jittered steps and their offsets in one go
+        if self.jitter_amp > 0:
+            n = steps + 1
+            mask = self._rng.random(n) < self.jitter_freq
+            xs[mask] += self._rng.uniform(-self.jitter_amp, self.jitter_amp, n)[mask]
+            ys[mask] += self._rng.uniform(-self.jitter_amp, self.jitter_amp, n)[mask]
+        
+        # Execute movement against a fixed deadline per step, so oversleeping
+        # one step doesn't push the rest back
+        deadlines = (np.linspace(0.0, duration, steps + 1) + time.perf_counter()).tolist()
+        
+        failsafe_check()
+        for i, (px, py, deadline) in enumerate(zip(xs.tolist(), ys.tolist(), deadlines)):
+            # Throwing the mouse into a corner still stops the bot mid-move
+            if i % FAILSAFE_CHECK_STEPS == FAILSAFE_CHECK_STEPS - 1:
+                failsafe_check()
             # Move
-            pyautogui.moveTo(pos.x, pos.y, _pause=False)
+            _move_cursor(px, py)
             
-            # Sleep remainder of time slice to match duration
-            elapsed = time.time() - start_time
-            target_time = duration * (i / steps)
-            if elapsed < target_time:
-                time.sleep(target_time - elapsed)
+            # Sleep until this step's deadline, if it hasn't passed already
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
 
     def click(self) -> Tuple[int, int]:
         # Click with human-like hesitation
@@ -162,11 +272,17 @@ class HumanMouse:
         did_overshoot = False
         
         if self.overshoot and random.random() < self.overshoot_prob:
-            # Calculate overshoot target
-            angle = random.uniform(0, 2 * math.pi)
-            dist = random.uniform(*self.over_dist)
-            over_x = x + int(math.cos(angle) * dist)
-            over_y = y + int(math.sin(angle) * dist)
+            # Calculate overshoot target: random direction by rejection on the
+            # unit square (~1.3 draws on average), no cos/sin
+            while True:
+                u = random.uniform(-1.0, 1.0)
+                v = random.uniform(-1.0, 1.0)
+                r2 = u * u + v * v
+                if 1e-9 < r2 <= 1.0:
+                    break
+            dist = random.uniform(*self.over_dist) / math.sqrt(r2)
+            over_x = x + int(u * dist)
+            over_y = y + int(v * dist)
             
             # Move to overshoot
             self.move_to(over_x, over_y)
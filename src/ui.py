@@ -1,8 +1,11 @@
 # Dashboard UI
 
+import itertools
+import json
 import threading
 import time
-from datetime import datetime, timedelta
+from pathlib import Path
+from datetime import datetime
 from typing import Optional, Callable
 from rich.console import Console, Group
 from rich.layout import Layout
@@ -12,6 +15,13 @@ from rich.table import Table
 from rich.text import Text
 from rich.align import Align
 from rich.rule import Rule
+from rich.style import Style
+
+# fastrlock is optional - cheaper uncontended acquire than threading.Lock when installed
+try:
+    from fastrlock.rlock import FastRLock as _Lock
+except ImportError:
+    _Lock = threading.Lock
 
 VERSION = "v0.4.1"
 
@@ -34,6 +44,10 @@ COLORS = {
     "active": "#10b981",
 }
 
+# Parsed once - Text/Panel take Style objects as-is, strings get re-parsed every frame
+STYLES = {name: Style.parse(color) for name, color in COLORS.items()}
+BOLD = {name: Style.parse(f"bold {color}") for name, color in COLORS.items()}
+
 HEADER_ART = (
     "███╗   ██╗███████╗██╗  ██╗██╗   ██╗███████╗         █████╗ ██╗   ██╗████████╗ ██████╗ ██████╗ ██╗     \n"
     "████╗  ██║██╔════╝╚██╗██╔╝██║   ██║██╔════╝        ██╔══██╗██║   ██║╚══██╔══╝██╔═══██╗██╔══██╗██║     \n"
@@ -47,50 +61,72 @@ HEADER_COMPACT = "▓▓▓ NEXUS AUTO-DL ▓▓▓"
 class Stats:
     # Session stats with JSON persistence
     STATS_FILE = "logs/stats.json"
+    SAVE_INTERVAL = 30.0  # Seconds between background saves (only when totals changed)
     
     def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._start = datetime.now()
-        self._paused_duration = timedelta(0)
-        self._pause_start: Optional[datetime] = datetime.now()  # Start paused (bot starts paused)
+        self._lock = _Lock()
+        # Runtime accounting on the monotonic clock, in float seconds (no datetime/timedelta per tick)
+        self._start = time.monotonic()
+        self._paused_duration = 0.0
+        self._pause_start: Optional[float] = self._start  # Start paused (bot starts paused)
+        # Counters are lock-free: next() on an itertools.count is atomic under the GIL,
+        # and the value it hands back is published with a plain attribute store
         self.cycles = 0
         self.matches = 0
         self.clicks = 0
         self.errors = 0
         self._total_clicks = 0
         self._total_matches = 0
+        self._cycles_ctr = itertools.count(1)
+        self._matches_ctr = itertools.count(1)
+        self._clicks_ctr = itertools.count(1)
+        self._errors_ctr = itertools.count(1)
+        self._total_clicks_ctr = itertools.count(1)
+        self._total_matches_ctr = itertools.count(1)
+        # Persistence runs on its own daemon thread, off the click path
+        self._save_dirty = False
+        self._saver_stop = threading.Event()
+        threading.Thread(target=self._save_loop, name="stats-save", daemon=True).start()
         
     def pause(self) -> None:
         with self._lock:
-            if not self._pause_start:
-                self._pause_start = datetime.now()
+            if self._pause_start is None:
+                self._pause_start = time.monotonic()
                 
     def resume(self) -> None:
         with self._lock:
-            if self._pause_start:
-                paused = datetime.now() - self._pause_start
-                self._paused_duration += paused
+            if self._pause_start is not None:
+                self._paused_duration += time.monotonic() - self._pause_start
                 self._pause_start = None
                 
     def inc_cycles(self) -> None:
-        with self._lock: self.cycles += 1
+        self.cycles = next(self._cycles_ctr)
         
     def inc_matches(self) -> None:
-        with self._lock: 
-            self.matches += 1
-            self._total_matches += 1
+        self.matches = next(self._matches_ctr)
+        self._total_matches = next(self._total_matches_ctr)
+        self._save_dirty = True
             
     def inc_clicks(self) -> None:
-        with self._lock: 
-            self.clicks += 1
-            self._total_clicks += 1
+        self.clicks = next(self._clicks_ctr)
+        self._total_clicks = next(self._total_clicks_ctr)
+        self._save_dirty = True
             
     def inc_errors(self) -> None:
-        with self._lock: self.errors += 1
+        self.errors = next(self._errors_ctr)
+        
+    def _save_loop(self) -> None:
+        # Write at most every SAVE_INTERVAL, and not at all while idle
+        while not self._saver_stop.wait(self.SAVE_INTERVAL):
+            if self._save_dirty:
+                self.save()
+    
+    def stop_saver(self) -> None:
+        # Stop the background saver (call save() after for the final write)
+        self._saver_stop.set()
         
     def save(self) -> None:
-        import json
-        from pathlib import Path
+        self._save_dirty = False  # Cleared first: an increment during the write dirties it again
         try:
             with self._lock:
                 data = {
@@ -104,27 +140,37 @@ class Stats:
         except Exception: pass
         
     def load(self) -> None:
-        import json
-        from pathlib import Path
         try:
             if Path(self.STATS_FILE).exists():
                 with open(self.STATS_FILE, 'r') as f:
                     data = json.load(f)
-                with self._lock:
-                    self._total_clicks = data.get("total_clicks", 0)
-                    self._total_matches = data.get("total_matches", 0)
+                total_clicks = data.get("total_clicks", 0)
+                total_matches = data.get("total_matches", 0)
+                self._total_clicks_ctr = itertools.count(total_clicks + 1)
+                self._total_clicks = total_clicks
+                self._total_matches_ctr = itertools.count(total_matches + 1)
+                self._total_matches = total_matches
         except Exception: pass
         
+    def active_seconds(self) -> int:
+        # Whole seconds of unpaused runtime
+        with self._lock:
+            return self._active_seconds()
+    
+    def counters(self) -> tuple:
+        # (cycles, matches, clicks, errors) - cheap change check for the dashboard
+        return (self.cycles, self.matches, self.clicks, self.errors)
+    
+    def _active_seconds(self) -> int:
+        now = time.monotonic()
+        current_pause = now - self._pause_start if self._pause_start is not None else 0.0
+        return max(0, int(now - self._start - self._paused_duration - current_pause))
+        
     def get(self) -> dict:
         """Returns dict with keys: runtime, runtime_sec, cycles, matches,
         clicks, errors, hit_rate, time_saved_min, total_clicks, total_matches."""
         with self._lock:
-            now = datetime.now()
-            current_pause = timedelta(0)
-            if self._pause_start:
-                current_pause = now - self._pause_start
-            total_active = (now - self._start) - (self._paused_duration + current_pause)
-            total_sec = max(0, int(total_active.total_seconds()))
+            total_sec = self._active_seconds()
             h, rem = divmod(total_sec, 3600)
             m, s = divmod(rem, 60)
             
@@ -144,20 +190,38 @@ class Stats:
                 "total_matches": self._total_matches
             }
 
-from collections import deque
-
 class LogBuffer:
+    # Fixed-capacity ring of log lines, stored as parallel timestamp/level/message
+    # slots that get overwritten in place (no per-line tuple or deque node)
     def __init__(self, max_lines: int = 15) -> None:
-        self._lines = deque(maxlen=max_lines)
-        self._lock = threading.Lock()
+        self._cap = max_lines
+        self._ts = [""] * max_lines
+        self._lvl = [""] * max_lines
+        self._msg = [""] * max_lines
+        self._head = 0   # Next slot to write
+        self._count = 0  # Filled slots, up to _cap
+        self._lock = _Lock()
         
     def add(self, message: str, level: str = "INFO") -> None:
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         with self._lock:
-            self._lines.append((timestamp, level, message))
+            i = self._head
+            self._ts[i] = timestamp
+            self._lvl[i] = level
+            self._msg[i] = message
+            self._head = (i + 1) % self._cap
+            if self._count < self._cap:
+                self._count += 1
                 
-    def get_all(self):
-        with self._lock: return list(self._lines)
+    def get_all(self, n: Optional[int] = None):
+        # Oldest first, as (timestamp, level, message); n keeps only the newest n
+        with self._lock:
+            cap, count = self._cap, self._count
+            if n is not None:
+                count = min(count, max(0, n))
+            start = (self._head - count) % cap
+            idx = [(start + k) % cap for k in range(count)]
+            return [(self._ts[i], self._lvl[i], self._msg[i]) for i in idx]
 
 class Dashboard:
     STATUS_IDLE = "idle"
@@ -182,48 +246,56 @@ class Dashboard:
         self._console = Console()
         self._stats = Stats()
         self._log = LogBuffer(max_lines=50)
-        self._status = self.STATUS_IDLE
-        self._status_detail = ""
-        self._current_template = ""
-        self._stealth_mode = False
-        self._stealth_action = ""
-        self._current_algo = ""
-        self._lock = threading.Lock()
+        # Bot-thread state, each swapped as one tuple so the refresh thread never sees a torn pair
+        self._status = (self.STATUS_IDLE, "")  # (status, detail)
+        self._current_target = ("", "")  # (template name, algo)
+        self._stealth = (False, "")  # (active, action)
+        # (key, panel) of the last header/footer, rebuilt only when what they show changes
+        self._header_cache = (None, None)
+        self._footer_cache = (None, None)
+        # Whole-frame skip: the last layout is handed back until a setter/log line marks
+        # it dirty or the frame key (clock second, counters, terminal size, night) moves
+        self._dirty = True
+        self._frame_key = None
+        self._layout = None
         
     @property
     def stats(self): return self._stats
     
     def log(self, message: str, level: str = "INFO"):
         self._log.add(message, level)
+        self._dirty = True
         
+    # Lock-free setters: a single attribute store is atomic, the refresh thread reads it on its next frame
     def set_status(self, status: str, detail: str = ""):
-        with self._lock:
-            self._status = status
-            self._status_detail = detail
+        self._status = (status, detail)
+        self._dirty = True
             
     def set_template(self, name: str, algo: str = ""):
-        with self._lock: 
-            self._current_template = name
-            self._current_algo = algo
+        self._current_target = (name, algo)
+        self._dirty = True
         
     def set_stealth(self, active: bool, action: str = ""):
-        with self._lock:
-            self._stealth_mode = active
-            self._stealth_action = action
+        self._stealth = (active, action)
+        self._dirty = True
             
     def pause_timer(self): self._stats.pause()
     def resume_timer(self): self._stats.resume()
     
     def start(self):
+        # Live pulls a fresh layout from _render on its own refresh thread,
+        # so the bot thread never has to pump redraws
         self._live = Live(
-            self._render(), console=self._console,
+            console=self._console,
+            get_renderable=self._render,
             refresh_per_second=1000 // self._refresh_ms,
             screen=True, transient=False
         )
         self._live.start()
         
     def update(self):
-        if self._live: self._live.update(self._render())
+        # Force an immediate redraw (the refresh thread catches up anyway)
+        if self._live: self._live.refresh()
         
     def stop(self):
         if self._live:
@@ -235,6 +307,16 @@ class Dashboard:
         return h >= self._night_hour or h < 6
         
     def _render(self):
+        key = (self._stats.active_seconds(), self._stats.counters(), self._console.size, self._is_night())
+        if not self._dirty and key == self._frame_key and self._layout is not None:
+            return self._layout
+        # Cleared before building, so a setter racing this frame marks the next one dirty again
+        self._dirty = False
+        self._frame_key = key
+        self._layout = self._build_layout()
+        return self._layout
+        
+    def _build_layout(self):
         layout = Layout()
         layout.split(
             Layout(name="header", size=9 if not self._compact else 4),
@@ -254,98 +336,116 @@ class Dashboard:
         return layout
         
     def _render_header(self):
-        if self._status == self.STATUS_IDLE:
-             badge = Text(" ● Idle ", style=f"bold {COLORS['idle']}")
-        elif self._status == self.STATUS_SCANNING:
-             badge = Text(" ⚡ Scanning ", style=f"bold {COLORS['active']}")
-        elif self._status == self.STATUS_STEALTH:
-             badge = Text(" ⚡ Stealth ", style=f"bold {COLORS['stealth']}")
-        elif self._status == self.STATUS_ERROR:
-             badge = Text(" ✖ Error ", style=f"bold {COLORS['error']}")
+        key = (self._status, self._profile, self._compact)
+        cached_key, panel = self._header_cache
+        if key != cached_key:
+            panel = self._build_header(*key)
+            self._header_cache = (key, panel)
+        return panel
+        
+    def _build_header(self, status_detail, profile, compact):
+        status, detail = status_detail
+        if status == self.STATUS_IDLE:
+             badge = Text(" ● Idle ", style=BOLD['idle'])
+        elif status == self.STATUS_SCANNING:
+             badge = Text(" ⚡ Scanning ", style=BOLD['active'])
+        elif status == self.STATUS_STEALTH:
+             badge = Text(" ⚡ Stealth ", style=BOLD['stealth'])
+        elif status == self.STATUS_ERROR:
+             badge = Text(" ✖ Error ", style=BOLD['error'])
         else:
-             badge = Text(f" ● {self._status} ", style=f"bold {COLORS['muted']}")
+             badge = Text(f" ● {status} ", style=BOLD['muted'])
              
-        header_text = Text(HEADER_COMPACT if self._compact else HEADER_ART.strip(), style=COLORS['heading'])
+        header_text = Text(HEADER_COMPACT if compact else HEADER_ART.strip(), style=STYLES['heading'])
         subtitle = Text()
-        subtitle.append(f"  {VERSION}  ", style=f"bold {COLORS['text_dim']}")
-        subtitle.append("│ Profile: ", style=COLORS['border'])
-        subtitle.append(self._profile or "None", style=f"bold {COLORS['text']}")
-        subtitle.append("  │  ", style=COLORS['border'])
+        subtitle.append(f"  {VERSION}  ", style=BOLD['text_dim'])
+        subtitle.append("│ Profile: ", style=STYLES['border'])
+        subtitle.append(profile or "None", style=BOLD['text'])
+        subtitle.append("  │  ", style=STYLES['border'])
         subtitle.append_text(badge)
-        if self._status_detail:
-            subtitle.append(f"  {self._status_detail}", style=COLORS['text_dim'])
+        if detail:
+            subtitle.append(f"  {detail}", style=STYLES['text_dim'])
             
-        return Panel(Align.center(Group(Align.center(header_text), Text(), Align.center(subtitle))), border_style=COLORS['border'])
+        return Panel(Align.center(Group(Align.center(header_text), Text(), Align.center(subtitle))), border_style=STYLES['border'])
 
     def _render_stats(self):
         data = self._stats.get()
         table = Table.grid(padding=(0, 2), expand=True)
-        table.add_column("L", justify="right", style=COLORS['muted'])
-        table.add_column("V", justify="left", style=f"bold {COLORS['text']}")
+        table.add_column("L", justify="right", style=STYLES['muted'])
+        table.add_column("V", justify="left", style=BOLD['text'])
         table.add_row("Runtime", data["runtime"])
         table.add_row("Cycles", str(data["cycles"]))
         table.add_row("Matches", str(data["matches"]))
         table.add_row("Clicks", str(data["clicks"]))
         hr = data["hit_rate"]
-        hr_color = COLORS['success'] if hr >= 80 else COLORS['warning'] if hr >= 50 else COLORS['error']
-        table.add_row("Hit Rate", Text(f"{hr:.1f}%", style=f"bold {hr_color}"))
+        hr_style = BOLD['success'] if hr >= 80 else BOLD['warning'] if hr >= 50 else BOLD['error']
+        table.add_row("Hit Rate", Text(f"{hr:.1f}%", style=hr_style))
         table.add_row("Saved", f"~{data['time_saved_min']} min")
         if data["errors"] > 0:
-            table.add_row("Errors", Text(str(data["errors"]), style=f"bold {COLORS['error']}"))
+            table.add_row("Errors", Text(str(data["errors"]), style=BOLD['error']))
             
-        return Panel(table, title=f"[{COLORS['heading']}]Live Stats[/]", border_style=COLORS['border'])
+        return Panel(table, title=Text("Live Stats", style=STYLES['heading']), border_style=STYLES['border'])
 
     def _render_stealth(self):
         lines = []
-        if self._stealth_mode:
-            lines.append(Align.center(Text("▓ ACTIVE ▓", style=f"bold {COLORS['stealth']}")))
+        active, action = self._stealth
+        if active:
+            lines.append(Align.center(Text("▓ ACTIVE ▓", style=BOLD['stealth'])))
             lines.append(Text())
-            lines.append(Align.center(Text(self._stealth_action, style=COLORS['stealth'])))
+            lines.append(Align.center(Text(action, style=STYLES['stealth'])))
             lines.append(Text())
-            lines.append(Align.center(Text("◉ ◉ ◉", style=f"bold {COLORS['stealth']}")))
+            lines.append(Align.center(Text("◉ ◉ ◉", style=BOLD['stealth'])))
         else:
-            lines.append(Align.center(Text("○ STANDBY ○", style=COLORS['muted'])))
+            lines.append(Align.center(Text("○ STANDBY ○", style=STYLES['muted'])))
             lines.append(Text())
-            lines.append(Align.center(Text("Waiting...", style=COLORS['text_dim'])))
+            lines.append(Align.center(Text("Waiting...", style=STYLES['text_dim'])))
             
-        if self._current_template:
+        template, algo = self._current_target
+        if template:
             lines.append(Text())
-            lines.append(Rule(style=COLORS['border']))
-            lines.append(Align.center(Text(f"Target: {self._current_template}", style=COLORS['text'])))
-            if hasattr(self, '_current_algo') and self._current_algo:
-                lines.append(Align.center(Text(f"[{self._current_algo}]", style=COLORS['text_dim'])))
+            lines.append(Rule(style=STYLES['border']))
+            lines.append(Align.center(Text(f"Target: {template}", style=STYLES['text'])))
+            if algo:
+                lines.append(Align.center(Text(f"[{algo}]", style=STYLES['text_dim'])))
             
-        return Panel(Group(*lines), title=f"[{COLORS['heading']}]Stealth[/]", border_style=COLORS['stealth'] if self._stealth_mode else COLORS['border'])
+        return Panel(Group(*lines), title=Text("Stealth", style=STYLES['heading']), border_style=STYLES['stealth'] if active else STYLES['border'])
 
     def _render_log(self):
-        lines = self._log.get_all()
         term_height = self._console.size.height
         avail = max(3, term_height - 25) # Approx
-        visible = lines[-avail:] if lines else []
+        visible = self._log.get_all(avail)  # Only the lines that fit, read straight off the ring
         
         text = Text()
         if not visible:
-            return Panel(Align.center(Text("Waiting...", style=COLORS['muted'])), title=f"[{COLORS['heading']}]Log[/]", border_style=COLORS['border'])
+            return Panel(Align.center(Text("Waiting...", style=STYLES['muted'])), title=Text("Log", style=STYLES['heading']), border_style=STYLES['border'])
             
         for ts, lvl, msg in visible:
-            text.append(f" {ts} ", style=COLORS['text_dim'])
-            c = COLORS.get(lvl.lower(), COLORS['info'])
-            text.append(f"[{lvl:^7}]", style=f"bold {c}")
-            text.append(f" {msg}\n", style=COLORS['text'])
+            text.append(f" {ts} ", style=STYLES['text_dim'])
+            text.append(f"[{lvl:^7}]", style=BOLD.get(lvl.lower(), BOLD['info']))
+            text.append(f" {msg}\n", style=STYLES['text'])
             
-        return Panel(Align(text, vertical="bottom"), title=f"[{COLORS['heading']}]Event Log[/]", border_style=COLORS['border'])
+        return Panel(Align(text, vertical="bottom"), title=Text("Event Log", style=STYLES['heading']), border_style=STYLES['border'])
 
     def _render_footer(self):
+        # Hotkeys are fixed per Dashboard, so only night mode can change it
+        night = self._is_night()
+        cached_night, panel = self._footer_cache
+        if night != cached_night:
+            panel = self._build_footer(night)
+            self._footer_cache = (night, panel)
+        return panel
+        
+    def _build_footer(self, night):
         f = Text()
-        f.append(f"  {self._pause_key} Start/Stop  ", style=COLORS['muted'])
-        f.append(f"{self._reload_key} Reload  ", style=COLORS['muted'])
-        f.append(f"{self._cycle_key} Strategy  ", style=COLORS['muted'])
-        f.append(f"{self._stop_key} Quit  ", style=COLORS['muted'])
-        if self._is_night(): f.append("  🌙 Night Mode", style=COLORS['text_dim'])
-        return Panel(Align.center(f), border_style=COLORS['border'])
+        f.append(f"  {self._pause_key} Start/Stop  ", style=STYLES['muted'])
+        f.append(f"{self._reload_key} Reload  ", style=STYLES['muted'])
+        f.append(f"{self._cycle_key} Strategy  ", style=STYLES['muted'])
+        f.append(f"{self._stop_key} Quit  ", style=STYLES['muted'])
+        if night: f.append("  🌙 Night Mode", style=STYLES['text_dim'])
+        return Panel(Align.center(f), border_style=STYLES['border'])
 
 def make_logger(dash: Dashboard):
     def log(msg: str, level: str = "INFO"):
+        # No redraw poke here - the Live refresh thread renders the new line on its next frame
         dash.log(msg, level)
-        dash.update()
     return log
@@ -1,16 +1,113 @@
 # Vision and template matching
 
+import os
 import time
 import mss
 import cv2
 import numpy as np
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple, Callable
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Callable
+
+# pyfftw is optional - planned FFTW transforms beat numpy's pocketfft when installed
+try:
+    import pyfftw
+except ImportError:
+    pyfftw = None
 
 # mss is fast but we instantiate it per capture or keep generic one
 # We'll use a class wrapper
 
+# Template-step correlation scores by config name. All normalized to 0-1 (sqdiff is flipped).
+# ccoeff (default) subtracts window means, so it ignores brightness shifts. ccorr is a somewhat
+# cheaper kernel but scores flat/bright areas higher; sqdiff costs about the same as ccoeff and
+# only suits near-identical buttons - retune the thresholds if you switch.
+CORRELATION_METHODS = {
+    "ccoeff": cv2.TM_CCOEFF_NORMED,
+    "ccorr": cv2.TM_CCORR_NORMED,
+    "sqdiff": cv2.TM_SQDIFF_NORMED,
+}
+
+# Template kinds, doubling as scan priority (lower = checked first)
+KIND_STOP = 0
+KIND_WEB = 1
+KIND_OTHER = 2
+
+# A prefetched frame older than this is dropped and grabbed again (e.g. the sleep was paused)
+PREFETCH_MAX_AGE = 0.25
+
+# Templates need this many pixels on their short side to survive two pyrDowns usefully;
+# shorter ones (most buttons) still get a coarse pass one level up, at 1/2 scale
+PYRAMID_MIN_SIDE = 32
+PYRAMID_MIN_SIDE_HALF = 16
+
+# Click-point noise: standard normals drawn from NumPy in batches, handed out in pairs
+_RNG = np.random.default_rng()
+_NORMALS: List[float] = []
+NORMAL_BATCH = 128
+
+def _normal_pair() -> Tuple[float, float]:
+    if len(_NORMALS) < 2:
+        _NORMALS.extend(_RNG.standard_normal(NORMAL_BATCH).tolist())
+    return _NORMALS.pop(), _NORMALS.pop()
+
+def _as_u8(img: np.ndarray) -> np.ndarray:
+    # Contiguous CV_8U so matchTemplate takes its integer SIMD kernel (never promoted to float)
+    if img.dtype != np.uint8:
+        scale = 1.0 / 257 if img.dtype == np.uint16 else 1.0
+        img = cv2.convertScaleAbs(img, alpha=scale)
+    return np.ascontiguousarray(img)
+
+@dataclass(slots=True)
+class TemplateEntry:
+    # Template decoded once at load time, with the template-side NCC terms precomputed.
+    # Pixel arrays and caches stay out of repr - a logged entry shouldn't dump images
+    name: str
+    image: np.ndarray = field(repr=False)  # As loaded (grayscale when matching in grayscale, else BGR)
+    gray: np.ndarray = field(repr=False)   # Contiguous uint8 grayscale copy used for correlation
+    mean: np.float32        # Mean intensity
+    norm: np.float32        # sqrt(sum((t - mean)^2)), the template term of the NCC denominator
+    kind: int = KIND_OTHER
+    gray_quarter: Optional[np.ndarray] = field(default=None, repr=False)  # 1/4-scale gray for the coarse pass (None if too small)
+    gray_half: Optional[np.ndarray] = field(default=None, repr=False)     # 1/2-scale gray, coarse pass for templates too small for 1/4
+    gray_umat: Optional[cv2.UMat] = field(default=None, repr=False)       # Device copy of gray, uploaded on first OpenCL match
+    features: Dict[str, tuple] = field(default_factory=dict, repr=False)  # (keypoints, descriptors) per detector, on first use
+    region: Optional[Tuple[int, int, int, int]] = None  # (x, y, w, h) search box from config, None = whole screen
+
+    @classmethod
+    def from_images(cls, items: Sequence[Tuple[str, np.ndarray, int]]) -> List["TemplateEntry"]:
+        # Build a whole profile at once: templates sharing a shape are stacked and
+        # get their mean/norm from one vectorized reduction per shape
+        images = [_as_u8(img) for _, img, _ in items]
+        grays = [img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) for img in images]
+        
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i, g in enumerate(grays):
+            groups.setdefault(g.shape, []).append(i)
+        
+        stats: List[Tuple[float, float]] = [(0.0, 0.0)] * len(grays)
+        for idx in groups.values():
+            flat = np.stack([grays[i] for i in idx]).reshape(len(idx), -1)
+            n = flat.shape[1]
+            # Exact integer sums off the uint8 data (no float copy): n * sum((t - mean)^2) = n*sq - s^2
+            s = flat.sum(axis=1, dtype=np.int64)
+            sq = np.einsum("ij,ij->i", flat, flat, dtype=np.int64)
+            means = s / n
+            norms = np.sqrt(np.maximum(n * sq - s * s, 0) / n)
+            for i, m, nv in zip(idx, means, norms):
+                stats[i] = (m, nv)
+        
+        entries = []
+        for (name, _, kind), image, gray, (mean, norm) in zip(items, images, grays, stats):
+            half = quarter = None
+            if min(gray.shape) >= PYRAMID_MIN_SIDE_HALF:
+                half = cv2.pyrDown(gray)
+            if min(gray.shape) >= PYRAMID_MIN_SIDE:
+                quarter = cv2.pyrDown(half)
+            entries.append(cls(name, image, gray, np.float32(mean), np.float32(norm), kind, quarter, half))
+        return entries
+
 @dataclass
 class MatchResult:
     # Template matching result with click coordinates
@@ -28,8 +125,6 @@ class MatchResult:
     
     def random_click_point(self, offset_ratio: float = 0.35) -> Tuple[int, int]:
         # Get random click point with Gaussian offset
-        import random
-        
         cx, cy = self.center
         
         # Gaussian offset - sigma set so 3σ ≈ offset_ratio (99.7% within bounds)
@@ -37,8 +132,9 @@ class MatchResult:
         sigma_y = (self.height * offset_ratio) / 3
         
         # Generate offset
-        offset_x = random.gauss(0, sigma_x)
-        offset_y = random.gauss(0, sigma_y)
+        nx, ny = _normal_pair()
+        offset_x = nx * sigma_x
+        offset_y = ny * sigma_y
         
         # Clamp to avoid clicking outside
         max_offset_x = self.width * 0.45
@@ -49,6 +145,69 @@ class MatchResult:
         
         return int(cx + offset_x), int(cy + offset_y)
 
+@dataclass(slots=True)
+class PreparedTemplate:
+    # Template transformed once for repeated FFT correlation against same-sized frames
+    entry: TemplateEntry
+    shape: Tuple[int, int]   # Screen (h, w) the spectrum was built for
+    conj_fft: np.ndarray = field(repr=False)  # conj(rfft2(template - mean)), zero-padded to the DFT size
+
+
+# Gray screen plus a device copy of it on the OpenCL path, shared across templates
+ScreenPrep = Tuple[np.ndarray, Optional[cv2.UMat]]
+
+
+def _prepare_screen(screen: np.ndarray, opencl: bool = False) -> ScreenPrep:
+    gray = screen if screen.ndim == 2 else cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+    gray = _as_u8(gray)
+    # One upload per frame on OpenCL; the GPU does the whole normalization itself
+    return gray, cv2.UMat(gray) if opencl else None
+
+
+def _window_sums(gray: np.ndarray, h: int, w: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Sum and sum of squares of every h x w window, read off the integral images
+    s, sq = cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+    win = s[h:, w:] - s[:-h, w:] - s[h:, :-w] + s[:-h, :-w]
+    win_sq = sq[h:, w:] - sq[:-h, w:] - sq[h:, :-w] + sq[:-h, :-w]
+    return win, win_sq
+
+
+def _normalize_ccoeff(num: np.ndarray, win: np.ndarray, win_sq: np.ndarray, n: int, t_norm: float) -> np.ndarray:
+    # CCOEFF numerator -> CCOEFF_NORMED score; flat windows/templates score 0
+    denom = np.sqrt(np.maximum(win_sq - win * win / n, 0.0)) * t_norm
+    out = np.zeros_like(num, dtype=np.float64)
+    np.divide(num, denom, out=out, where=denom > 1e-6)
+    # Rounding in the split form can land a hair outside [-1, 1]
+    return np.clip(out, -1.0, 1.0, out=out)
+
+
+# Full-res search window (x0, y0, x1, y1)
+Roi = Tuple[int, int, int, int]
+
+def _roi_around(x: int, y: int, w: int, h: int, scale: int, shape: Tuple[int, ...]) -> Roi:
+    # Window around a coarse hit at full-res (x, y): the template plus a margin for
+    # the coarse grid step and pyrDown blur, clamped so it still fits the template
+    sh, sw = shape[:2]
+    mx, my = scale + w // 4, scale + h // 4
+    x0 = max(0, min(x - mx, sw - w))
+    y0 = max(0, min(y - my, sh - h))
+    return x0, y0, min(sw, max(x + w + mx, x0 + w)), min(sh, max(y + h + my, y0 + h))
+
+def _roi_from_region(template: TemplateEntry, shape: Tuple[int, ...]) -> Roi:
+    # Configured (x, y, w, h) box as a window, clamped to the screen and grown
+    # to at least the template size so a too-tight box still gets one position
+    x, y, rw, rh = template.region
+    h, w = template.gray.shape
+    sh, sw = shape[:2]
+    x0 = max(0, min(x, sw - w))
+    y0 = max(0, min(y, sh - h))
+    return x0, y0, min(sw, max(x + rw, x0 + w)), min(sh, max(y + rh, y0 + h))
+
+def _fits(buf: Optional[np.ndarray], shape: Tuple[int, ...]) -> bool:
+    # Whether a caller-supplied buffer can take a frame of this shape as-is
+    return buf is not None and buf.shape == shape and buf.dtype == np.uint8 and buf.flags.c_contiguous
+
+
 class ScreenCapture:
     # Screen grabber using mss (way faster than pyautogui)
     
@@ -56,12 +215,33 @@ class ScreenCapture:
         self._sct: Optional[mss.mss] = None
         self.monitor_index = monitor_index
         self._monitor_offset: tuple = (0, 0)  # Screen-absolute offset for current monitor
+        # Output buffers, allocated on first capture and reused for every frame after
+        self._bgr: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._gray_half: Optional[np.ndarray] = None
+        self._gray_q: Optional[np.ndarray] = None
+        # Gray prefetch: a capture thread with its own mss handle fills the back buffer
+        self._gray_back: Optional[np.ndarray] = None
+        self._prefetch_pool: Optional[ThreadPoolExecutor] = None
+        self._prefetch_sct: Optional[mss.mss] = None  # Only touched on the capture thread
+        self._pending: Optional[Future] = None
         
     def __enter__(self):
-        self._sct = mss.mss()
+        # One mss handle for the object's lifetime - reuse a lazily opened one instead of leaking it
+        if self._sct is None:
+            self._sct = mss.mss()
         return self
         
     def __exit__(self, exc_type, exc_str, exc_tb):
+        self.close()
+    
+    def close(self) -> None:
+        # Release the mss handles (and the capture thread, if prefetch was used)
+        if self._prefetch_pool is not None:
+            self._pending = None
+            self._prefetch_pool.submit(self._close_prefetch_sct)
+            self._prefetch_pool.shutdown(wait=True)
+            self._prefetch_pool = None
         if self._sct:
             self._sct.close()
             self._sct = None
@@ -72,23 +252,120 @@ class ScreenCapture:
             self._sct = mss.mss()
         return self._sct.monitors
             
-    def capture(self) -> np.ndarray:
-        if not self._sct:
-            self._sct = mss.mss()
+    def _grab(self, sct: Optional[mss.mss] = None) -> np.ndarray:
+        if sct is None:
+            if not self._sct:
+                self._sct = mss.mss()
+            sct = self._sct
         
         # Pick the right monitor (clamped to valid range)
-        monitor_idx = max(0, min(self.monitor_index, len(self._sct.monitors) - 1))
-        monitor = self._sct.monitors[monitor_idx]
+        monitor_idx = max(0, min(self.monitor_index, len(sct.monitors) - 1))
+        monitor = sct.monitors[monitor_idx]
         
         # Store monitor offset for coordinate translation
         self._monitor_offset = (monitor.get('left', 0), monitor.get('top', 0))
         
-        img = self._sct.grab(monitor)
+        img = sct.grab(monitor)
         
-        # Convert to numpy/opencv BGR
-        frame = np.array(img)
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
-        return frame
+        # Zero-copy BGRA view over mss's raw pixels
+        return np.frombuffer(img.raw, dtype=np.uint8).reshape(img.height, img.width, 4)
+    
+    def capture(self, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        # BGR frame. The array is reused by the next capture - copy it to keep it,
+        # or pass dst (uint8, h x w x 3) to have the frame written into your own buffer.
+        return self._to_bgr(self._grab(), dst)
+    
+    def capture_with_gray(self) -> Tuple[np.ndarray, np.ndarray]:
+        # (BGR, gray) of one grab, both converted straight from the BGRA view -
+        # for color matching that still wants a gray frame (features, pyramid)
+        frame = self._grab()
+        bgr = self._to_bgr(frame, None)
+        h, w = frame.shape[:2]
+        if self._gray is None or self._gray.shape != (h, w):
+            self._gray = np.empty((h, w), dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=self._gray)
+        return bgr, self._gray
+    
+    def _to_bgr(self, frame: np.ndarray, dst: Optional[np.ndarray]) -> np.ndarray:
+        h, w = frame.shape[:2]
+        if _fits(dst, (h, w, 3)):
+            return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=dst)
+        if self._bgr is None or self._bgr.shape[:2] != (h, w):
+            self._bgr = np.empty((h, w, 3), dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=self._bgr)
+        return self._bgr
+    
+    def capture_gray(self, dst: Optional[np.ndarray] = None) -> np.ndarray:
+        # Grayscale frame converted straight from BGRA. Same reuse/dst rules as capture().
+        # Takes the prefetched frame instead when one is pending and still fresh.
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            back, grabbed_at = pending.result()
+            if back is not None and time.monotonic() - grabbed_at <= PREFETCH_MAX_AGE:
+                # Swap buffers: the frame becomes current, the old one is the next back buffer
+                self._gray_back, self._gray = self._gray, back
+                if _fits(dst, back.shape):
+                    np.copyto(dst, back)
+                    return dst
+                return self._gray
+        frame = self._grab()
+        h, w = frame.shape[:2]
+        if self._gray is None or self._gray.shape != (h, w):
+            self._gray = np.empty((h, w), dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=self._gray)
+        if _fits(dst, (h, w)):
+            # Still converted into _gray first: the pyramid levels are built from it
+            np.copyto(dst, self._gray)
+            return dst
+        return self._gray
+    
+    def set_monitor(self, monitor_index: int) -> None:
+        # Switch monitors; the reused buffers resize themselves on the next grab
+        if monitor_index != self.monitor_index:
+            self.monitor_index = monitor_index
+            self._pending = None  # A prefetched frame would be from the old monitor
+    
+    def prefetch_gray(self) -> None:
+        # Start grabbing the next gray frame in the background, so the grab overlaps
+        # whatever the caller does until its next capture_gray()
+        if self._pending is not None:
+            return
+        if self._prefetch_pool is None:
+            self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._pending = self._prefetch_pool.submit(self._prefetch_grab, self._gray_back)
+    
+    def _prefetch_grab(self, back: Optional[np.ndarray]) -> Tuple[Optional[np.ndarray], float]:
+        # Runs on the capture thread; mss handles are per-thread, so it gets its own
+        try:
+            if self._prefetch_sct is None:
+                self._prefetch_sct = mss.mss()
+            frame = self._grab(self._prefetch_sct)
+        except Exception:
+            return None, 0.0  # capture_gray() falls back to a synchronous grab
+        h, w = frame.shape[:2]
+        if back is None or back.shape != (h, w):
+            back = np.empty((h, w), dtype=np.uint8)
+        cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY, dst=back)
+        return back, time.monotonic()
+    
+    def _close_prefetch_sct(self) -> None:
+        if self._prefetch_sct is not None:
+            self._prefetch_sct.close()
+            self._prefetch_sct = None
+    
+    def capture_gray_pyramid(self) -> Tuple[np.ndarray, np.ndarray]:
+        # (1/2, 1/4)-scale pyramid levels of the last capture_gray() frame (no new grab)
+        if self._gray is None:
+            self.capture_gray()
+        h, w = self._gray.shape
+        half = ((h + 1) // 2, (w + 1) // 2)
+        quarter = ((half[0] + 1) // 2, (half[1] + 1) // 2)
+        if self._gray_half is None or self._gray_half.shape != half:
+            self._gray_half = np.empty(half, dtype=np.uint8)
+            self._gray_q = np.empty(quarter, dtype=np.uint8)
+        cv2.pyrDown(self._gray, dst=self._gray_half)
+        cv2.pyrDown(self._gray_half, dst=self._gray_q)
+        return self._gray_half, self._gray_q
     
     @property
     def monitor_offset(self) -> tuple:
@@ -96,88 +373,339 @@ class ScreenCapture:
         return self._monitor_offset
 
 class TemplateMatcher:
-    # Handles template matching with cascade of strategies
+    # Handles template matching with cascade of strategies.
+    # Single-strategy variants are subclasses that override _dispatch, so the hot
+    # path never branches on the strategy - build them with make_matcher().
+    strategy = "cascade"
+    uses_correlation = True  # Whether _dispatch runs the correlation step (needs screen prep)
     
     def __init__(
         self,
         confidence: float = 0.8,
         marginal: float = 0.6,
         grayscale: bool = True,
-        strategy: str = "cascade",
         debug_path: Optional[Path] = None,
-        log_fn: Optional[Callable[[str, str], None]] = None
+        log_fn: Optional[Callable[[str, str], None]] = None,
+        use_opencl: bool = True,
+        method: str = "ccoeff"
     ) -> None:
         self._conf = confidence
+        # Correlation score for the template step (see CORRELATION_METHODS); unknown names get ccoeff
+        self._method = CORRELATION_METHODS.get(method, cv2.TM_CCOEFF_NORMED)
         self._marginal = marginal
         self._gray = grayscale
-        self._strategy = strategy.lower()
         self._debug = debug_path
         self._log = log_fn or (lambda m, l: None)
         
+        # OpenCL (T-API) path for gray correlation - idle iGPUs beat the CPU kernel on full frames
+        self._ocl = bool(use_opencl and self._gray and cv2.ocl.haveOpenCL())
+        if self._ocl:
+            cv2.ocl.setUseOpenCL(True)
+        
         # Feature detectors
         self._orb = cv2.ORB_create(nfeatures=800, scaleFactor=1.2, nlevels=8)
         self._akaze = cv2.AKAZE_create(threshold=0.001)
-        self._matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
         
-    def match(self, template: np.ndarray, screen: np.ndarray, name: str = "") -> MatchResult:
-        if self._strategy == "template":
-            return self._match_template_only(template, screen, name)
-        elif self._strategy == "orb":
-            return self._match_orb_only(template, screen, name)
-        elif self._strategy == "akaze":
-            return self._match_akaze_only(template, screen, name)
+        # FFT plans keyed by screen shape (see prepare_fft)
+        self._fft_plans: Dict[Tuple[int, int], Tuple[Callable, Callable]] = {}
+        
+    def _fft_plan(self, shape: Tuple[int, int]) -> Tuple[Callable, Callable]:
+        # Forward/inverse real FFTs padded to an FFT-friendly size >= the screen
+        plan = self._fft_plans.get(shape)
+        if plan is None:
+            fft_shape = (cv2.getOptimalDFTSize(shape[0]), cv2.getOptimalDFTSize(shape[1]))
+            if pyfftw is not None:
+                spec_shape = (fft_shape[0], fft_shape[1] // 2 + 1)
+                threads = os.cpu_count() or 1
+                fwd = pyfftw.builders.rfft2(
+                    pyfftw.empty_aligned(shape, dtype="float64"), s=fft_shape,
+                    planner_effort="FFTW_MEASURE", threads=threads
+                )
+                inv = pyfftw.builders.irfft2(
+                    pyfftw.empty_aligned(spec_shape, dtype="complex128"), s=fft_shape,
+                    planner_effort="FFTW_MEASURE", threads=threads
+                )
+                plan = (fwd, inv)
+            else:
+                plan = (
+                    lambda a: np.fft.rfft2(a, s=fft_shape),
+                    lambda f: np.fft.irfft2(f, s=fft_shape),
+                )
+            self._fft_plans[shape] = plan
+        return plan
+    
+    def coarse_match(
+        self, template: TemplateEntry, screen_pyramid: Tuple[np.ndarray, np.ndarray]
+    ) -> Optional[Tuple[float, Tuple[int, int], int]]:
+        # Correlation at the coarsest level the template has (1/4, else 1/2):
+        # (score, best location mapped to full-res, scale factor).
+        # None when the template has no usable coarse level.
+        if template.gray_quarter is not None:
+            t_c, s_c, scale = template.gray_quarter, screen_pyramid[1], 4
+        elif template.gray_half is not None:
+            t_c, s_c, scale = template.gray_half, screen_pyramid[0], 2
         else:
-            return self._match_cascade(template, screen, name)
+            return None
+        if t_c.shape[0] > s_c.shape[0] or t_c.shape[1] > s_c.shape[1]:
+            return None
+        res = cv2.matchTemplate(s_c, t_c, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return max_val, (max_loc[0] * scale, max_loc[1] * scale), scale
+    
+    @property
+    def fft_verify(self) -> bool:
+        # Whether repeated single-template polls should go through prepare_fft/match_prepared.
+        # Only with pyfftw: the numpy.fft fallback measured ~2x slower per poll than
+        # matchTemplate. And only for plain CCOEFF template matching, since match_prepared
+        # has no feature fallback and ignores the configured correlation method.
+        return pyfftw is not None and self.strategy == "template" and self._method == cv2.TM_CCOEFF_NORMED
+    
+    def prepare_fft(self, template: TemplateEntry, shape: Tuple[int, int]) -> PreparedTemplate:
+        # Transform the zero-mean template once; match_prepared() then only
+        # pays for the screen-side FFT on each poll
+        h, w = template.gray.shape
+        padded = np.zeros(shape, dtype=np.float64)
+        padded[:h, :w] = template.gray - template.mean
+        fwd, _ = self._fft_plan(shape)
+        return PreparedTemplate(template, shape, np.conj(fwd(padded)))
+    
+    def match_prepared(self, prepared: PreparedTemplate, screen: np.ndarray) -> MatchResult:
+        # CCOEFF_NORMED via FFT with a cached template spectrum. Correlation only -
+        # meant for fixed text checks, not the feature-matching cascade.
+        s_img = screen if screen.ndim == 2 else cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+        if s_img.shape != prepared.shape:
+            prepared = self.prepare_fft(prepared.entry, s_img.shape)
+        
+        entry = prepared.entry
+        h, w = entry.gray.shape
+        out_h, out_w = s_img.shape[0] - h + 1, s_img.shape[1] - w + 1
+        if out_h <= 0 or out_w <= 0:
+            return MatchResult(False)
+        
+        fwd, inv = self._fft_plan(prepared.shape)
+        # Zero-mean template => correlation equals the CCOEFF numerator
+        num = inv(fwd(s_img.astype(np.float64)) * prepared.conj_fft)[:out_h, :out_w]
+        win, win_sq = _window_sums(_as_u8(s_img), h, w)
+        res = _normalize_ccoeff(num, win, win_sq, h * w, float(entry.norm))
+        
+        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+        return MatchResult(
+            found=max_val >= self._marginal,
+            x=max_loc[0],
+            y=max_loc[1],
+            width=w,
+            height=h,
+            confidence=max_val,
+            algorithm="template"
+        )
+        
+    def match(self, template: TemplateEntry, screen: np.ndarray) -> MatchResult:
+        return self._dispatch(template, screen, None)
             
-    def _correlate(self, template: np.ndarray, screen: np.ndarray) -> MatchResult:
-        # Standard template matching with OpenCV
-        # Convert to gray if needed
-        t_img = template
-        s_img = screen
+    def match_many(
+        self,
+        templates: Sequence[TemplateEntry],
+        screen: np.ndarray,
+        screen_pyramid: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        coarse_floor: float = 0.0,
+        executor: Optional[Executor] = None,
+        prep: Optional[ScreenPrep] = None
+    ) -> Iterator[Tuple[TemplateEntry, MatchResult]]:
+        # Match templates against one frame in order, sharing the screen-side work:
+        # gray conversion (and the OpenCL upload) happen once for the whole batch.
+        # Lazy, so the caller can stop at the first hit. With screen_pyramid (1/2, 1/4 levels),
+        # non-stop templates scoring under coarse_floor at coarse scale are skipped without a full match,
+        # and the rest are correlated at full res only in a window around their coarse peak.
+        # With an executor, the coarse pass and correlation run concurrently (OpenCV drops
+        # the GIL), and everything after it - feature fallbacks, logging, debug snapshots -
+        # runs here in priority order, so a hit never waits on a lower-priority ORB/AKAZE
+        # search and the first hit is the same one as a serial scan.
+        # Pass prep (from prepare_screen) to share it across several batches on one frame.
+        if prep is None:
+            prep = self.prepare_screen(screen)
         
-        if self._gray:
-            if len(t_img.shape) == 3: t_img = cv2.cvtColor(t_img, cv2.COLOR_BGR2GRAY)
-            if len(s_img.shape) == 3: s_img = cv2.cvtColor(s_img, cv2.COLOR_BGR2GRAY)
+        # The OpenCL path queues on one device anyway, keep it on the calling thread.
+        # Feature-only strategies have no correlation step to farm out.
+        if executor is None or self._ocl or len(templates) < 2 or not self.uses_correlation:
+            for template in templates:
+                result = self._match_one(template, screen, prep, screen_pyramid, coarse_floor)
+                if result is not None:
+                    yield template, result
+            return
+        
+        futures = [
+            executor.submit(self._correlate_one, t, screen, prep, screen_pyramid, coarse_floor)
+            for t in templates
+        ]
+        try:
+            for template, fut in zip(templates, futures):
+                corr = fut.result()
+                if corr is not None:
+                    yield template, self._after_correlate(template, screen, prep, corr)
+        finally:
+            # Caller stopped at a hit: drop what hasn't started, and let in-flight
+            # correlations finish before the capture buffers get reused
+            for fut in futures:
+                fut.cancel()
+            wait(futures)
+    
+    def prepare_screen(self, screen: np.ndarray, gray: Optional[np.ndarray] = None) -> Optional[ScreenPrep]:
+        # Screen-side prep for one frame: gray (+ device copy on OpenCL) for gray correlation,
+        # or just the gray frame (for the feature detectors) when the frame is color.
+        # None when there's nothing to share. Pass gray if the capture already made one.
+        if self._gray and self.uses_correlation:
+            return _prepare_screen(screen if gray is None else gray, self._ocl)
+        if screen.ndim == 3:
+            if gray is None:
+                gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+            return (gray, None)
+        return None
+    
+    def _match_one(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        screen_pyramid: Optional[Tuple[np.ndarray, np.ndarray]], coarse_floor: float
+    ) -> Optional[MatchResult]:
+        # One serial match_many step; None when the coarse pass rejects the template
+        keep, roi = self._window(template, screen, screen_pyramid, coarse_floor)
+        if not keep:
+            return None
+        return self._dispatch(template, screen, prep, roi)
+    
+    def _correlate_one(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        screen_pyramid: Optional[Tuple[np.ndarray, np.ndarray]], coarse_floor: float
+    ) -> Optional[MatchResult]:
+        # Pooled match_many step: coarse pass + correlation only. No feature search,
+        # logging or debug snapshots, so a template after the hit leaves nothing behind
+        keep, roi = self._window(template, screen, screen_pyramid, coarse_floor)
+        if not keep:
+            return None
+        return self._correlate(template, screen, prep, roi)
+    
+    def _window(
+        self, template: TemplateEntry, screen: np.ndarray,
+        screen_pyramid: Optional[Tuple[np.ndarray, np.ndarray]], coarse_floor: float
+    ) -> Tuple[bool, Optional[Roi]]:
+        # Where to correlate: (False, None) when the coarse pass rejects the template,
+        # else (True, roi) with roi None for the whole frame.
+        # A template that survives is refined at full res only around its coarse peak.
+        # A configured region replaces both: the window is already small.
+        if template.region is not None:
+            return True, _roi_from_region(template, screen.shape)
+        if screen_pyramid is None or template.kind == KIND_STOP:
+            return True, None
+        coarse = self.coarse_match(template, screen_pyramid)
+        if coarse is None:
+            return True, None
+        score, (cx, cy), scale = coarse
+        if score < coarse_floor:
+            return False, None
+        h, w = template.gray.shape
+        return True, _roi_around(cx, cy, w, h, scale, screen.shape)
+    
+    def _dispatch(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        roi: Optional[Roi] = None
+    ) -> MatchResult:
+        return self._match_cascade(template, screen, template.name, prep, roi)
+    
+    def _after_correlate(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        res: MatchResult
+    ) -> MatchResult:
+        # The rest of _dispatch given its correlation result (match_many's pooled path)
+        return self._cascade_rest(template, screen, template.name, prep, res)
             
-        res = cv2.matchTemplate(s_img, t_img, cv2.TM_CCOEFF_NORMED)
+    def _correlate(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep] = None,
+        roi: Optional[Roi] = None
+    ) -> MatchResult:
+        # Standard template matching with OpenCV
+        # Template is already gray (converted at load), only the screen may need it
+        gray_path = self._gray or template.image.ndim == 2
+        t_img = template.gray if gray_path else template.image
+        h, w = t_img.shape[:2]
+        if h > screen.shape[0] or w > screen.shape[1]:
+            return MatchResult(False)
+        
+        method = self._method
+        x0 = y0 = 0
+        if roi is not None:
+            # Refinement inside a small window (a view, no copy): OpenCV's fused
+            # kernel is cheap at this size, no integral images needed
+            x0, y0, x1, y1 = roi
+            if gray_path:
+                s_img = prep[0] if prep is not None else screen
+                if s_img.ndim == 3:
+                    s_img = cv2.cvtColor(s_img, cv2.COLOR_BGR2GRAY)
+            else:
+                s_img = screen
+            res = cv2.matchTemplate(s_img[y0:y1, x0:x1], t_img, method)
+        elif gray_path:
+            if prep is None:
+                prep = _prepare_screen(screen, self._ocl)
+            s_umat = prep[1]
+            if s_umat is not None:
+                # OpenCL: fused kernel on the device, only the minMaxLoc scalars come back
+                if template.gray_umat is None:
+                    template.gray_umat = cv2.UMat(t_img)
+                res = cv2.matchTemplate(s_umat, template.gray_umat, method)
+            else:
+                # OpenCV's fused normalized kernel - splitting it into plain CCORR plus
+                # integral-image normalization in NumPy measured slower on full frames
+                res = cv2.matchTemplate(prep[0], t_img, method)
+        else:
+            # Color matching keeps OpenCV's fused per-channel normalization
+            res = cv2.matchTemplate(screen, t_img, method)
         min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+        if method == cv2.TM_SQDIFF_NORMED:
+            # Distance, not similarity: best is the minimum, flipped into a 0-1 score
+            max_val, max_loc = 1.0 - min_val, min_loc
+        max_val = min(max_val, 1.0)
         
-        h, w = t_img.shape[:2]
         return MatchResult(
             found=max_val >= self._marginal,
-            x=max_loc[0],
-            y=max_loc[1],
+            x=x0 + max_loc[0],
+            y=y0 + max_loc[1],
             width=w,
             height=h,
             confidence=max_val,
             algorithm="template"
         )
 
-    def _feature_match(self, template: np.ndarray, screen: np.ndarray, detector, name: str = "") -> MatchResult:
+    def _feature_match(
+        self, template: TemplateEntry, screen: np.ndarray, detector, name: str = "",
+        prep: Optional[ScreenPrep] = None
+    ) -> MatchResult:
+        # Detectors run on gray: the frame's shared gray view when there is one,
+        # instead of each detectAndCompute converting a color frame again
+        # Template side never changes, so its keypoints/descriptors are computed once per detector
+        s_gray = prep[0] if prep is not None else screen
         try:
-            kp1, des1 = detector.detectAndCompute(template, None)
-            kp2, des2 = detector.detectAndCompute(screen, None)
+            key = detector.getDefaultName()
+            feats = template.features.get(key)
+            if feats is None:
+                feats = detector.detectAndCompute(template.gray, None)
+                template.features[key] = feats
+            kp1, des1 = feats
+            kp2, des2 = detector.detectAndCompute(s_gray, None)
             
             if des1 is None or des2 is None or len(kp1) < 2 or len(kp2) < 2:
                 return MatchResult(False)
                 
-            matches = self._matcher.knnMatch(des1, des2, k=2)
-            
-            good = []
-            for pair in matches:
-                if len(pair) == 2:
-                    m, n = pair
-                    if m.distance < 0.75 * n.distance:
-                        good.append(m)
+            # Two nearest screen descriptors per template descriptor, straight to arrays
+            # (sorted, same as knnMatch k=2), then the Lowe ratio test as one mask
+            dist, nidx = cv2.batchDistance(des1, des2, cv2.CV_32S, normType=cv2.NORM_HAMMING, K=2)
+            good = np.flatnonzero(dist[:, 0] < 0.75 * dist[:, 1])
                     
             if len(good) > 8:
-                src_pts = np.float32([kp1[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
-                dst_pts = np.float32([kp2[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
+                src_pts = cv2.KeyPoint_convert(kp1)[good].reshape(-1, 1, 2)
+                dst_pts = cv2.KeyPoint_convert(kp2)[nidx[good, 0]].reshape(-1, 1, 2)
                 
                 M, mask = cv2.findHomography(src_pts, dst_pts, cv2.RANSAC, 5.0)
                 
                 if M is not None:
-                    h, w = template.shape[:2]
+                    h, w = template.gray.shape[:2]
                     pts = np.float32([[0, 0], [0, h-1], [w-1, h-1], [w-1, 0]]).reshape(-1, 1, 2)
                     dst = cv2.perspectiveTransform(pts, M)
                     
@@ -186,8 +714,8 @@ class TemplateMatcher:
                     x_max = int(np.max(dst[:, 0, 0]))
                     y_max = int(np.max(dst[:, 0, 1]))
                     
-                    # Estimate confidence by inliers ratio
-                    conf = len(good) / len(matches) if len(matches) > 0 else 0
+                    # Confidence = share of ratio-test survivors RANSAC kept as inliers
+                    conf = int(mask.sum()) / len(good)
                     
                     return MatchResult(
                         found=True,
@@ -206,7 +734,7 @@ class TemplateMatcher:
         if not self._debug: return
         try:
             self._debug.mkdir(parents=True, exist_ok=True)
-            vis = screen.copy()
+            vis = cv2.cvtColor(screen, cv2.COLOR_GRAY2BGR) if screen.ndim == 2 else screen.copy()
             cv2.rectangle(
                 vis, 
                 (result.x, result.y), 
@@ -220,10 +748,14 @@ class TemplateMatcher:
         except Exception:
             pass
 
-    def _match_template_only(self, template: np.ndarray, screen: np.ndarray, name: str) -> MatchResult:
-        result = self._correlate(template, screen)
+    def _match_template_only(
+        self, template: TemplateEntry, screen: np.ndarray, name: str,
+        prep: Optional[ScreenPrep] = None, roi: Optional[Roi] = None
+    ) -> MatchResult:
+        return self._template_rest(screen, name, self._correlate(template, screen, prep, roi))
+    
+    def _template_rest(self, screen: np.ndarray, name: str, result: MatchResult) -> MatchResult:
         result.algorithm = "template"
-        
         if result.found:
             if result.confidence >= self._conf:
                 self._save_debug(screen, result, name)
@@ -232,8 +764,8 @@ class TemplateMatcher:
                 self._save_debug(screen, result, name)
         return result
     
-    def _match_orb_only(self, template: np.ndarray, screen: np.ndarray, name: str) -> MatchResult:
-        result = self._feature_match(template, screen, self._orb, name)
+    def _match_orb_only(self, template: TemplateEntry, screen: np.ndarray, name: str, prep: Optional[ScreenPrep] = None) -> MatchResult:
+        result = self._feature_match(template, screen, self._orb, name, prep)
         result.algorithm = "orb"
         if result.found:
             if result.confidence < self._conf:
@@ -241,8 +773,8 @@ class TemplateMatcher:
             self._save_debug(screen, result, name)
         return result
         
-    def _match_akaze_only(self, template: np.ndarray, screen: np.ndarray, name: str) -> MatchResult:
-        result = self._feature_match(template, screen, self._akaze, name)
+    def _match_akaze_only(self, template: TemplateEntry, screen: np.ndarray, name: str, prep: Optional[ScreenPrep] = None) -> MatchResult:
+        result = self._feature_match(template, screen, self._akaze, name, prep)
         result.algorithm = "akaze"
         if result.found:
             if result.confidence < self._conf:
@@ -250,9 +782,19 @@ class TemplateMatcher:
             self._save_debug(screen, result, name)
         return result
 
-    def _match_cascade(self, template: np.ndarray, screen: np.ndarray, name: str) -> MatchResult:
-        # 1. Template Match (Fastest)
-        res = self._correlate(template, screen)
+    def _match_cascade(
+        self, template: TemplateEntry, screen: np.ndarray, name: str,
+        prep: Optional[ScreenPrep] = None, roi: Optional[Roi] = None
+    ) -> MatchResult:
+        # 1. Template Match (Fastest) - inside roi when the coarse pass located it
+        #    (features below still search the whole frame)
+        res = self._correlate(template, screen, prep, roi)
+        return self._cascade_rest(template, screen, name, prep, res)
+    
+    def _cascade_rest(
+        self, template: TemplateEntry, screen: np.ndarray, name: str,
+        prep: Optional[ScreenPrep], res: MatchResult
+    ) -> MatchResult:
         res.algorithm = "template"
         
         if res.confidence >= self._conf:
@@ -263,7 +805,7 @@ class TemplateMatcher:
         # If template match was "okay" (marginal), we can try ORB to confirm.
         # But for now, we just proceed to feature matching if template fails.
             
-        res_orb = self._feature_match(template, screen, self._orb, name)
+        res_orb = self._feature_match(template, screen, self._orb, name, prep)
         res_orb.algorithm = "orb"
         if res_orb.found: # Feature matching doesn't return confidence same way
              # We trust feature match if it found enough good matches (filtered inside)
@@ -271,7 +813,7 @@ class TemplateMatcher:
              return res_orb
              
         # 3. AKAZE (Slowest, handles scale/rotation)
-        res_akaze = self._feature_match(template, screen, self._akaze, name)
+        res_akaze = self._feature_match(template, screen, self._akaze, name, prep)
         res_akaze.algorithm = "akaze"
         if res_akaze.found:
             self._save_debug(screen, res_akaze, name)
@@ -285,3 +827,54 @@ class TemplateMatcher:
              return res
              
         return MatchResult(False)
+
+
+class _TemplateOnlyMatcher(TemplateMatcher):
+    strategy = "template"
+    
+    def _dispatch(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        roi: Optional[Roi] = None
+    ) -> MatchResult:
+        return self._match_template_only(template, screen, template.name, prep, roi)
+    
+    def _after_correlate(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        res: MatchResult
+    ) -> MatchResult:
+        return self._template_rest(screen, template.name, res)
+
+
+class _OrbMatcher(TemplateMatcher):
+    strategy = "orb"
+    uses_correlation = False
+    
+    def _dispatch(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        roi: Optional[Roi] = None
+    ) -> MatchResult:
+        return self._match_orb_only(template, screen, template.name, prep)
+
+
+class _AkazeMatcher(TemplateMatcher):
+    strategy = "akaze"
+    uses_correlation = False
+    
+    def _dispatch(
+        self, template: TemplateEntry, screen: np.ndarray, prep: Optional[ScreenPrep],
+        roi: Optional[Roi] = None
+    ) -> MatchResult:
+        return self._match_akaze_only(template, screen, template.name, prep)
+
+
+MATCHERS = {
+    "cascade": TemplateMatcher,
+    "template": _TemplateOnlyMatcher,
+    "orb": _OrbMatcher,
+    "akaze": _AkazeMatcher,
+}
+
+
+def make_matcher(strategy: str = "cascade", **kwargs) -> TemplateMatcher:
+    # Pick the matcher class for a strategy name once (unknown names fall back to cascade)
+    return MATCHERS.get(strategy.lower(), TemplateMatcher)(**kwargs)